@@ -0,0 +1,139 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from classification import PERFORMANCE_TIERS, classify
+
+RATING_BAND_WIDTH = 200
+DIMENSIONS = ['summoner_region', 'performance_tier', 'rating_band']
+MEASURES = ['players', 'rated', 'wins', 'num_played', 'place_sum', 'winrate_sum', 'placement_sum',
+            'rating_players', 'rating_sum', 'item_players', 'ad', 'ap', 'tank']
+
+COLUMNS = [
+    'summoner_region',
+    'rating_numeric',
+    '{results}.wins',
+    '{results}.num_played',
+    '{results}.place_sum',
+    'stats.{scope}.ItemData.AD',
+    'stats.{scope}.ItemData.AP',
+    'stats.{scope}.ItemData.Tank'
+]
+
+
+def empty():
+    return pd.DataFrame(columns=DIMENSIONS + MEASURES)
+
+
+def build(frame):
+    if len(frame) == 0:
+        return empty()
+    frame = frame.copy()
+    numeric = [col for col in COLUMNS if col != 'summoner_region']
+    frame[numeric] = frame[numeric].apply(pd.to_numeric, errors='coerce')
+    wins = frame['{results}.wins'].to_numpy(dtype=np.float64)
+    num_played = frame['{results}.num_played'].to_numpy(dtype=np.float64)
+    place_sum = frame['{results}.place_sum'].to_numpy(dtype=np.float64)
+    rated = num_played > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        winrate = np.where(rated, wins / num_played * 100, np.nan)
+        placement = np.where(rated, place_sum / num_played, np.nan)
+    rating = frame['rating_numeric']
+    ad = frame['stats.{scope}.ItemData.AD']
+
+    measures = pd.DataFrame({
+        'summoner_region': frame['summoner_region'].to_numpy(),
+        'performance_tier': classify(pd.DataFrame({'winrate': winrate, 'avg_placement': placement}),
+                                     PERFORMANCE_TIERS).to_numpy(),
+        'rating_band': (rating // RATING_BAND_WIDTH * RATING_BAND_WIDTH).astype('Int64').to_numpy(),
+        'players': 1,
+        'rated': rated.astype(np.int64),
+        'wins': frame['{results}.wins'].to_numpy(),
+        'num_played': frame['{results}.num_played'].to_numpy(),
+        'place_sum': frame['{results}.place_sum'].to_numpy(),
+        'winrate_sum': np.where(rated, winrate, 0.0),
+        'placement_sum': np.where(rated, placement, 0.0),
+        'rating_players': rating.notna().astype(np.int64).to_numpy(),
+        'rating_sum': rating.fillna(0).to_numpy(),
+        'item_players': ad.notna().astype(np.int64).to_numpy(),
+        'ad': ad.to_numpy(),
+        'ap': frame['stats.{scope}.ItemData.AP'].to_numpy(),
+        'tank': frame['stats.{scope}.ItemData.Tank'].to_numpy(),
+    })
+    return measures.groupby(DIMENSIONS, dropna=False, sort=True).sum().reset_index()
+
+
+def merge(cubes):
+    cubes = [cube for cube in cubes if len(cube)]
+    if not cubes:
+        return empty()
+    if len(cubes) == 1:
+        return cubes[0]
+    return pd.concat(cubes, ignore_index=True).groupby(DIMENSIONS, dropna=False, sort=True).sum().reset_index()
+
+
+def rollup(cube, by=None, **filters):
+    for dim, values in filters.items():
+        cube = cube[cube[dim].isin(values if isinstance(values, (list, tuple, set)) else [values])]
+    if by:
+        totals = cube.groupby(by, dropna=False, sort=True)[MEASURES].sum()
+    else:
+        totals = cube[MEASURES].sum().to_frame().T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        totals['pooled_winrate'] = totals['wins'] / totals['num_played'] * 100
+        totals['mean_winrate'] = totals['winrate_sum'] / totals['rated']
+        totals['mean_placement'] = totals['placement_sum'] / totals['rated']
+        totals['mean_rating'] = totals['rating_sum'] / totals['rating_players']
+        for measure in ('ad', 'ap', 'tank'):
+            totals[f'mean_{measure}'] = totals[measure] / totals['item_players']
+    return totals
+
+
+def read_cube(path):
+    return pd.read_csv(path, dtype={'summoner_region': str, 'performance_tier': str, 'rating_band': 'Int64'},
+                       keep_default_na=False, na_values={'rating_band': ['']})
+
+
+def write_cube(cube, path):
+    cube.to_csv(path, index=False)
+    return path
+
+
+def main(argv=None):
+    from dataset import CLEANED_CUBE
+
+    parser = argparse.ArgumentParser(description="Truy vấn cube tổng hợp region × performance tier × rating band")
+    parser.add_argument('--cube', default=CLEANED_CUBE)
+    parser.add_argument('--by', default='summoner_region',
+                        help=f"Chiều gộp, cách nhau bởi dấu phẩy ({', '.join(DIMENSIONS)})")
+    parser.add_argument('--region', default=None, help="Lọc theo khu vực, cách nhau bởi dấu phẩy")
+    parser.add_argument('--tier', default=None, help="Lọc theo performance tier, cách nhau bởi dấu phẩy")
+    args = parser.parse_args(argv)
+
+    by = [dim.strip() for dim in args.by.split(',') if dim.strip()]
+    unknown = [dim for dim in by if dim not in DIMENSIONS]
+    if unknown:
+        print(f"Không có chiều: {', '.join(unknown)} (có: {', '.join(DIMENSIONS)})")
+        return 2
+    filters = {}
+    if args.region:
+        filters['summoner_region'] = args.region.split(',')
+    if args.tier:
+        filters['performance_tier'] = args.tier.split(',')
+    try:
+        cube = read_cube(args.cube)
+    except FileNotFoundError:
+        print(f"Không tìm thấy {args.cube} - chạy clean_data.py trước")
+        return 2
+    totals = rollup(cube, by, **filters)
+    columns = ['players', 'pooled_winrate', 'mean_winrate', 'mean_placement', 'mean_rating',
+               'mean_ad', 'mean_ap', 'mean_tank']
+    with pd.option_context('display.width', 160, 'display.max_rows', 200):
+        print(totals[columns].round(2).to_string())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,126 +1,204 @@
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from scipy import stats
 import numpy as np
 
-df = pd.read_csv('data/leaderboard_cleaned.csv')
-
-damage_data = df[['stats.RecentResult.damage_percentile_sum', 
-                   'stats.RecentResult.board_strength_percentile_sum',
-                   'summoner_region',
-                   'stats.wins',
-                   'stats.num_played']].dropna()
-
-damage_data = damage_data.rename(columns={
-    'stats.RecentResult.damage_percentile_sum': 'damage',
-    'stats.RecentResult.board_strength_percentile_sum': 'board_strength',
-    'summoner_region': 'region'
-})
-
-damage_data['winrate'] = (damage_data['stats.wins'] / damage_data['stats.num_played'] * 100)
-
-def classify_playstyle(row):
-    damage = row['damage']
-    board = row['board_strength']
-    
-    damage_median = damage_data['damage'].median()
-    board_median = damage_data['board_strength'].median()
-    
-    if damage > damage_median and board > board_median:
-        return 'High Tempo (Aggressive)'
-    elif damage < damage_median and board < board_median:
-        return 'Eco (Conservative)'
-    elif damage > damage_median:
-        return 'Damage Focus'
+from classification import MEDIAN, PLAYSTYLES, classify, cut_points
+from dataset import load
+from figures import save_figure
+from streaming_stats import describe
+
+COLUMNS = [
+    'rank',
+    'stats.{scope}.damage_percentile_sum',
+    'stats.{scope}.board_strength_percentile_sum',
+    'summoner_region',
+    'winrate'
+]
+
+SVG_MAX_POINTS = 5000
+WEBGL_MAX_POINTS = 100000
+DENSITY_BINS = 200
+HOVER_TOP_N = 500
+
+PLAYSTYLE_COLORS = {
+    'High Tempo (Aggressive)': '#FF6B6B',
+    'Eco (Conservative)': '#4ECDC4',
+    'Damage Focus': '#FFE66D',
+    'Board Strength Focus': '#95E1D3'
+}
+
+TITLE = 'Phân tích Phong cách chơi: Eco vs High Tempo<br><sub>Scatter Plot với Regression Line</sub>'
+
+LABELS = {
+    'damage': 'Damage Percentile Sum (Sức mạnh đội hình)',
+    'board_strength': 'Board Strength Percentile Sum (Giá trị đội hình)',
+    'playstyle': 'Phong cách chơi',
+    'winrate': 'Winrate (%)'
+}
+
+
+def render_mode(n):
+    if n <= SVG_MAX_POINTS:
+        return 'svg'
+    if n <= WEBGL_MAX_POINTS:
+        return 'webgl'
+    return 'density'
+
+
+def density_grid(x, y, bins=DENSITY_BINS):
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    return counts.T, x_centers, y_centers
+
+
+def density_figure(damage_data, go):
+    counts, x_centers, y_centers = density_grid(damage_data['damage'].to_numpy(),
+                                                damage_data['board_strength'].to_numpy())
+    z = np.where(counts > 0, np.log10(counts, where=counts > 0, out=np.zeros_like(counts)) + 1, np.nan)
+    fig = go.Figure(go.Heatmap(
+        x=x_centers,
+        y=y_centers,
+        z=z,
+        customdata=counts.astype(np.int64),
+        colorscale='Viridis',
+        colorbar=dict(title='log10(số người chơi)', x=1.02),
+        hovertemplate='Damage: %{x:.0f}<br>Board: %{y:.0f}<br>Số người chơi: %{customdata}<extra></extra>',
+        name='Mật độ'
+    ))
+
+    top = damage_data.nsmallest(HOVER_TOP_N, 'rank')
+    for style, color in PLAYSTYLE_COLORS.items():
+        players = top[top['playstyle'] == style]
+        fig.add_trace(go.Scattergl(
+            x=players['damage'],
+            y=players['board_strength'],
+            mode='markers',
+            name=f'{style} (top {HOVER_TOP_N})',
+            marker=dict(color=color, size=6, line=dict(color='black', width=0.5)),
+            customdata=players[['rank', 'region', 'winrate']].to_numpy(),
+            hovertemplate=('Rank #%{customdata[0]} (%{customdata[1]})<br>Damage: %{x}<br>Board: %{y}'
+                           '<br>Winrate: %{customdata[2]:.1f}%<extra></extra>')
+        ))
+
+    fig.update_layout(
+        title=TITLE + f'<br><sub>Mật độ {len(damage_data):,} người chơi, hover chi tiết cho top {HOVER_TOP_N}</sub>',
+        xaxis_title=LABELS['damage'],
+        yaxis_title=LABELS['board_strength'],
+        legend=dict(x=1.15)
+    )
+    return fig
+
+
+def run():
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from scipy import stats
+
+    df = load(COLUMNS)
+
+    damage_data = df[['rank',
+                       'stats.{scope}.damage_percentile_sum', 
+                       'stats.{scope}.board_strength_percentile_sum',
+                       'summoner_region',
+                       'winrate']].dropna()
+
+    damage_data = damage_data.rename(columns={
+        'stats.{scope}.damage_percentile_sum': 'damage',
+        'stats.{scope}.board_strength_percentile_sum': 'board_strength',
+        'summoner_region': 'region'
+    })
+
+    damage_data['playstyle'] = classify(damage_data, PLAYSTYLES)
+    cuts = cut_points(damage_data, PLAYSTYLES)
+    damage_median = cuts[('damage', MEDIAN.q)]
+    board_median = cuts[('board_strength', MEDIAN.q)]
+
+    slope, intercept, r_value, p_value, std_err = stats.linregress(
+        damage_data['damage'], 
+        damage_data['board_strength']
+    )
+
+    x_range = np.array([damage_data['damage'].min(), damage_data['damage'].max()])
+    y_pred = slope * x_range + intercept
+
+    mode = render_mode(len(damage_data))
+    if mode == 'density':
+        fig = density_figure(damage_data, go)
     else:
-        return 'Board Strength Focus'
-
-damage_data['playstyle'] = damage_data.apply(classify_playstyle, axis=1)
-
-slope, intercept, r_value, p_value, std_err = stats.linregress(
-    damage_data['damage'], 
-    damage_data['board_strength']
-)
-
-x_range = np.linspace(damage_data['damage'].min(), damage_data['damage'].max(), 100)
-y_pred = slope * x_range + intercept
-
-fig = px.scatter(
-    damage_data,
-    x='damage',
-    y='board_strength',
-    color='playstyle',
-    size='winrate',
-    hover_data=['region', 'winrate'],
-    title='Phân tích Phong cách chơi: Eco vs High Tempo<br><sub>Scatter Plot với Regression Line</sub>',
-    labels={
-        'damage': 'Damage Percentile Sum (Sức mạnh đội hình)',
-        'board_strength': 'Board Strength Percentile Sum (Giá trị đội hình)',
-        'playstyle': 'Phong cách chơi',
-        'winrate': 'Winrate (%)'
-    },
-    color_discrete_map={
-        'High Tempo (Aggressive)': '#FF6B6B',
-        'Eco (Conservative)': '#4ECDC4',
-        'Damage Focus': '#FFE66D',
-        'Board Strength Focus': '#95E1D3'
-    }
-)
-
-fig.add_trace(
-    go.Scatter(
-        x=x_range,
-        y=y_pred,
-        mode='lines',
-        name=f'Regression Line (R² = {r_value**2:.3f})',
-        line=dict(color='red', width=3, dash='dash'),
-        hovertemplate='Predicted: %{y:.1f}<extra></extra>'
+        fig = px.scatter(
+            damage_data,
+            x='damage',
+            y='board_strength',
+            color='playstyle',
+            size='winrate',
+            hover_data=['region', 'winrate'],
+            title=TITLE,
+            labels=LABELS,
+            color_discrete_map=PLAYSTYLE_COLORS,
+            render_mode=mode
+        )
+
+    fig.add_trace(
+        go.Scatter(
+            x=x_range,
+            y=y_pred,
+            mode='lines',
+            name=f'Regression Line (R² = {r_value**2:.3f})',
+            line=dict(color='red', width=3, dash='dash'),
+            hovertemplate='Predicted: %{y:.1f}<extra></extra>'
+        )
     )
-)
-
-fig.add_hline(
-    y=damage_data['board_strength'].median(),
-    line_dash="dot",
-    line_color="gray",
-    annotation_text="Median Board Strength"
-)
-
-fig.add_vline(
-    x=damage_data['damage'].median(),
-    line_dash="dot",
-    line_color="gray",
-    annotation_text="Median Damage"
-)
-
-fig.update_layout(
-    height=700,
-    font=dict(size=11),
-    hovermode='closest'
-)
-
-fig.write_html('visualizations/playstyle_scatter.html')
-print("✓ Đã tạo biểu đồ: visualizations/playstyle_scatter.html")
-
-print("\n=== THỐNG KÊ PHONG CÁCH CHƠI ===")
-print(f"\nHệ số tương quan (R²): {r_value**2:.4f}")
-print(f"P-value: {p_value:.6f}")
-print(f"Slope: {slope:.4f}")
-
-print("\n=== PHÂN BỐ PHONG CÁCH CHƠI ===")
-playstyle_counts = damage_data['playstyle'].value_counts()
-for style, count in playstyle_counts.items():
-    pct = count / len(damage_data) * 100
-    avg_wr = damage_data[damage_data['playstyle'] == style]['winrate'].mean()
-    print(f"{style}: {count} người ({pct:.1f}%) - Avg WR: {avg_wr:.2f}%")
-
-print("\n=== THỐNG KÊ THEO CHỈ SỐ ===")
-print(f"Damage Percentile Sum:")
-print(f"  Mean: {damage_data['damage'].mean():.2f}")
-print(f"  Median: {damage_data['damage'].median():.2f}")
-print(f"  Std: {damage_data['damage'].std():.2f}")
-
-print(f"\nBoard Strength Percentile Sum:")
-print(f"  Mean: {damage_data['board_strength'].mean():.2f}")
-print(f"  Median: {damage_data['board_strength'].median():.2f}")
-print(f"  Std: {damage_data['board_strength'].std():.2f}")
+
+    damage = describe(damage_data['damage'])
+    board = describe(damage_data['board_strength'])
+
+    fig.add_hline(
+        y=board_median,
+        line_dash="dot",
+        line_color="gray",
+        annotation_text="Median Board Strength"
+    )
+
+    fig.add_vline(
+        x=damage_median,
+        line_dash="dot",
+        line_color="gray",
+        annotation_text="Median Damage"
+    )
+
+    fig.update_layout(
+        height=700,
+        font=dict(size=11),
+        hovermode='closest'
+    )
+
+    path = save_figure(fig, 'playstyle_scatter.html')
+    print(f"✓ Đã tạo biểu đồ: {path}")
+    if mode != 'svg':
+        print(f"  Chế độ hiển thị: {mode} ({len(damage_data)} điểm)")
+
+    print("\n=== THỐNG KÊ PHONG CÁCH CHƠI ===")
+    print(f"\nHệ số tương quan (R²): {r_value**2:.4f}")
+    print(f"P-value: {p_value:.6f}")
+    print(f"Slope: {slope:.4f}")
+
+    print("\n=== PHÂN BỐ PHONG CÁCH CHƠI ===")
+    playstyle_counts = damage_data['playstyle'].value_counts()
+    for style, count in playstyle_counts.items():
+        pct = count / len(damage_data) * 100
+        avg_wr = damage_data[damage_data['playstyle'] == style]['winrate'].mean()
+        print(f"{style}: {count} người ({pct:.1f}%) - Avg WR: {avg_wr:.2f}%")
+
+    print("\n=== THỐNG KÊ THEO CHỈ SỐ ===")
+    print(f"Damage Percentile Sum:")
+    print(f"  Mean: {damage['mean']:.2f}")
+    print(f"  Median: {damage_median:.2f}")
+    print(f"  Std: {damage['std']:.2f}")
+
+    print(f"\nBoard Strength Percentile Sum:")
+    print(f"  Mean: {board['mean']:.2f}")
+    print(f"  Median: {board_median:.2f}")
+    print(f"  Std: {board['std']:.2f}")
+
+
+if __name__ == '__main__':
+    run()
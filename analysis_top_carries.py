@@ -1,162 +1,149 @@
-import pandas as pd
-import json
-import ast
-from collections import Counter
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import networkx as nx
-import plotly.graph_objects as go
-
-df = pd.read_csv('data/leaderboard_cleaned.csv')
-
-all_carries = []
-character_stats = {}
-
-for carries_str in df['stats.RecentResult.topCarries'].dropna():
-    if carries_str and carries_str != '[]':
-        try:
-            carries = ast.literal_eval(carries_str)
-            for carry in carries:
-                char_id = carry['character_id'].replace('TFT15_', '')
-                count = carry['count']
-                avg_place = carry['avg']
-                
-                all_carries.append(char_id)
-                
-                if char_id not in character_stats:
-                    character_stats[char_id] = {'total_count': 0, 'avg_placements': []}
-                
-                character_stats[char_id]['total_count'] += count
-                character_stats[char_id]['avg_placements'].append(avg_place)
-        except:
-            continue
-
-carry_counter = Counter(all_carries)
-top_carries = carry_counter.most_common(20)
-
-for char in character_stats:
-    character_stats[char]['avg_placement'] = sum(character_stats[char]['avg_placements']) / len(character_stats[char]['avg_placements'])
-
-wordcloud = WordCloud(
-    width=1200,
-    height=600,
-    background_color='white',
-    colormap='plasma',
-    relative_scaling=0.5,
-    min_font_size=10
-).generate_from_frequencies(dict(carry_counter))
-
-plt.figure(figsize=(15, 8))
-plt.imshow(wordcloud, interpolation='bilinear')
-plt.axis('off')
-plt.title('Word Cloud - Tướng Carry Phổ Biến Nhất\n(Kích thước = Tần suất sử dụng)', 
-          fontsize=16, fontweight='bold', pad=20)
-plt.tight_layout(pad=0)
-plt.savefig('visualizations/top_carries_wordcloud.png', dpi=300, bbox_inches='tight')
-print("✓ Đã tạo biểu đồ: visualizations/top_carries_wordcloud.png")
-
-top_15_chars = [char for char, _ in top_carries[:15]]
-
-G = nx.Graph()
-
-for char, count in top_carries[:15]:
-    G.add_node(char, size=count, avg_place=character_stats[char]['avg_placement'])
-
-edge_weights = {}
-for carries_str in df['stats.RecentResult.topCarries'].dropna():
-    if carries_str and carries_str != '[]':
-        try:
-            carries = ast.literal_eval(carries_str)
-            chars = [c['character_id'].replace('TFT15_', '') for c in carries]
-            chars = [c for c in chars if c in top_15_chars]
-            
-            for i in range(len(chars)):
-                for j in range(i+1, len(chars)):
-                    edge = tuple(sorted([chars[i], chars[j]]))
-                    edge_weights[edge] = edge_weights.get(edge, 0) + 1
-        except:
-            continue
-
-for edge, weight in edge_weights.items():
-    if weight > 2:
-        G.add_edge(edge[0], edge[1], weight=weight)
-
-pos = nx.spring_layout(G, k=2, iterations=50)
-
-edge_trace = []
-for edge in G.edges():
-    x0, y0 = pos[edge[0]]
-    x1, y1 = pos[edge[1]]
-    weight = G.edges[edge]['weight']
-    edge_trace.append(
-        go.Scatter(
-            x=[x0, x1, None],
-            y=[y0, y1, None],
-            mode='lines',
-            line=dict(width=weight/2, color='rgba(125, 125, 125, 0.3)'),
-            hoverinfo='none',
-            showlegend=False
+from dataset import load_carries
+from figures import asset_path, output_file, save_figure
+from graph_layout import LAYOUT_CACHE_NAME, LayoutCache
+
+COLUMNS = []
+
+NETWORK_TOP_N = 15
+NETWORK_MIN_COUNT = 3
+
+
+def run():
+    import matplotlib.pyplot as plt
+    from wordcloud import WordCloud
+    import networkx as nx
+    import plotly.graph_objects as go
+
+    from carry_cooccurrence import cooccurrence
+
+    carries = load_carries()
+
+    carry_stats = carries.groupby('champion', observed=True, sort=False).agg(
+        picks=('puuid', 'size'),
+        total_count=('count', 'sum'),
+        avg_placement=('avg', 'mean')
+    ).sort_values('picks', ascending=False, kind='stable')
+    carry_stats.index = carry_stats.index.astype(str)
+
+    carry_counter = carry_stats['picks']
+    top_carries = list(carry_counter.head(20).items())
+
+    wordcloud = WordCloud(
+        width=1200,
+        height=600,
+        background_color='white',
+        colormap='plasma',
+        relative_scaling=0.5,
+        min_font_size=10
+    ).generate_from_frequencies(carry_counter.to_dict())
+
+    plt.figure(figsize=(15, 8))
+    plt.imshow(wordcloud, interpolation='bilinear')
+    plt.axis('off')
+    plt.title('Word Cloud - Tướng Carry Phổ Biến Nhất\n(Kích thước = Tần suất sử dụng)', 
+              fontsize=16, fontweight='bold', pad=20)
+    plt.tight_layout(pad=0)
+    path = output_file('top_carries_wordcloud.png')
+    plt.savefig(path, dpi=300, bbox_inches='tight')
+    print(f"✓ Đã tạo biểu đồ: {path}")
+
+    network_chars = [char for char, _ in top_carries[:NETWORK_TOP_N]]
+
+    G = nx.Graph()
+
+    for char, count in top_carries[:NETWORK_TOP_N]:
+        G.add_node(char, size=count, avg_place=carry_stats.loc[char, 'avg_placement'])
+
+    pairs = cooccurrence(carries, min_count=NETWORK_MIN_COUNT)
+    pairs = pairs[pairs['champion_a'].isin(network_chars) & pairs['champion_b'].isin(network_chars)]
+
+    for row in pairs.itertuples():
+        G.add_edge(row.champion_a, row.champion_b, weight=row.count, lift=row.lift)
+
+    layouts = LayoutCache(asset_path(LAYOUT_CACHE_NAME))
+    pos = layouts.layout(G.nodes(), G.edges(data='weight'), k=2, iterations=50)
+    layouts.save()
+
+    edge_trace = []
+    for edge in G.edges():
+        x0, y0 = pos[edge[0]]
+        x1, y1 = pos[edge[1]]
+        weight = G.edges[edge]['weight']
+        edge_trace.append(
+            go.Scatter(
+                x=[x0, x1, None],
+                y=[y0, y1, None],
+                mode='lines',
+                line=dict(width=weight/2, color='rgba(125, 125, 125, 0.3)'),
+                hoverinfo='none',
+                showlegend=False
+            )
         )
-    )
 
-node_x = []
-node_y = []
-node_size = []
-node_color = []
-node_text = []
-
-for node in G.nodes():
-    x, y = pos[node]
-    node_x.append(x)
-    node_y.append(y)
-    size = G.nodes[node]['size']
-    avg_place = G.nodes[node]['avg_place']
-    node_size.append(size * 2)
-    node_color.append(avg_place)
-    node_text.append(f"{node}<br>Picks: {size}<br>Avg Place: {avg_place:.2f}")
-
-node_trace = go.Scatter(
-    x=node_x, y=node_y,
-    mode='markers+text',
-    text=[node for node in G.nodes()],
-    textposition="top center",
-    hovertext=node_text,
-    hoverinfo='text',
-    marker=dict(
-        size=node_size,
-        color=node_color,
-        colorscale='RdYlGn_r',
-        showscale=True,
-        colorbar=dict(
-            title="Avg<br>Placement",
-            thickness=15,
-            xanchor='left',
-            title_side='right'
+    node_x = []
+    node_y = []
+    node_size = []
+    node_color = []
+    node_text = []
+
+    for node in G.nodes():
+        x, y = pos[node]
+        node_x.append(x)
+        node_y.append(y)
+        size = G.nodes[node]['size']
+        avg_place = G.nodes[node]['avg_place']
+        node_size.append(size * 2)
+        node_color.append(avg_place)
+        node_text.append(f"{node}<br>Picks: {size}<br>Avg Place: {avg_place:.2f}")
+
+    node_trace = go.Scatter(
+        x=node_x, y=node_y,
+        mode='markers+text',
+        text=[node for node in G.nodes()],
+        textposition="top center",
+        hovertext=node_text,
+        hoverinfo='text',
+        marker=dict(
+            size=node_size,
+            color=node_color,
+            colorscale='RdYlGn_r',
+            showscale=True,
+            colorbar=dict(
+                title="Avg<br>Placement",
+                thickness=15,
+                xanchor='left',
+                title_side='right'
+            ),
+            line=dict(width=2, color='white')
         ),
-        line=dict(width=2, color='white')
-    ),
-    showlegend=False
-)
-
-fig = go.Figure(data=edge_trace + [node_trace])
-
-fig.update_layout(
-    title='Network Graph - Mối quan hệ giữa các tướng Carry<br><sub>Kích thước node = Số lần pick | Màu = Avg Placement | Độ dày đường = Xuất hiện cùng nhau</sub>',
-    showlegend=False,
-    hovermode='closest',
-    margin=dict(b=20, l=5, r=5, t=80),
-    xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-    yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-    height=700,
-    plot_bgcolor='rgba(240, 240, 240, 0.5)'
-)
-
-fig.write_html('visualizations/top_carries_network.html')
-print("✓ Đã tạo biểu đồ: visualizations/top_carries_network.html")
-
-print("\n=== TOP 20 TƯỚNG CARRY PHỔ BIẾN ===")
-print(f"{'Rank':<5} {'Champion':<20} {'Picks':<10} {'Avg Placement':<15}")
-print("-" * 50)
-for i, (char, count) in enumerate(top_carries, 1):
-    avg_place = character_stats[char]['avg_placement']
-    print(f"{i:<5} {char:<20} {count:<10} {avg_place:<15.2f}")
+        showlegend=False
+    )
+
+    fig = go.Figure(data=edge_trace + [node_trace])
+
+    fig.update_layout(
+        title='Network Graph - Mối quan hệ giữa các tướng Carry<br><sub>Kích thước node = Số lần pick | Màu = Avg Placement | Độ dày đường = Xuất hiện cùng nhau</sub>',
+        showlegend=False,
+        hovermode='closest',
+        margin=dict(b=20, l=5, r=5, t=80),
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        height=700,
+        plot_bgcolor='rgba(240, 240, 240, 0.5)'
+    )
+
+    path = save_figure(fig, 'top_carries_network.html')
+    print(f"✓ Đã tạo biểu đồ: {path}")
+    stats = layouts.last
+    print(f"  Layout: {stats['mode']} ({stats['moved']}/{stats['nodes']} node di chuyển, {stats['seconds'] * 1000:.1f} ms)")
+
+    print("\n=== TOP 20 TƯỚNG CARRY PHỔ BIẾN ===")
+    print(f"{'Rank':<5} {'Champion':<20} {'Picks':<10} {'Avg Placement':<15}")
+    print("-" * 50)
+    for i, (char, count) in enumerate(top_carries, 1):
+        avg_place = carry_stats.loc[char, 'avg_placement']
+        print(f"{i:<5} {char:<20} {count:<10} {avg_place:<15.2f}")
+
+
+if __name__ == '__main__':
+    run()
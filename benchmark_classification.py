@@ -0,0 +1,108 @@
+import argparse
+import time
+
+import numpy as np
+
+from classification import PERFORMANCE_TIERS, PLAYSTYLES, classify
+from dataset import load
+
+
+def legacy_classify_playstyle(damage_data):
+    def classify_playstyle(row):
+        damage = row['damage']
+        board = row['board_strength']
+
+        damage_median = damage_data['damage'].median()
+        board_median = damage_data['board_strength'].median()
+
+        if damage > damage_median and board > board_median:
+            return 'High Tempo (Aggressive)'
+        elif damage < damage_median and board < board_median:
+            return 'Eco (Conservative)'
+        elif damage > damage_median:
+            return 'Damage Focus'
+        else:
+            return 'Board Strength Focus'
+
+    return damage_data.apply(classify_playstyle, axis=1)
+
+
+def legacy_classify_performance(perf_data):
+    def classify_performance(row):
+        wr = row['winrate']
+        ap = row['avg_placement']
+
+        if wr >= 25 and ap <= 3.5:
+            return 'Elite'
+        elif wr >= 20 and ap <= 4.0:
+            return 'High Performer'
+        elif wr >= 15 and ap <= 4.5:
+            return 'Above Average'
+        else:
+            return 'Average'
+
+    return perf_data.apply(classify_performance, axis=1)
+
+
+CASES = [
+    ('playstyle', PLAYSTYLES, legacy_classify_playstyle, 2),
+    ('performance', PERFORMANCE_TIERS, legacy_classify_performance, 1),
+]
+
+
+def sample_frame(base, rows, rng):
+    frame = base.iloc[rng.integers(0, len(base), rows)].reset_index(drop=True)
+    jitter = rng.normal(0, 1, (rows, 2))
+    frame['damage'] = frame['damage'] + jitter[:, 0]
+    frame['board_strength'] = frame['board_strength'] + jitter[:, 1]
+    return frame
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="So sánh classify() với các hàm apply(axis=1) cũ")
+    parser.add_argument('--sizes', default='1000,100000,1000000')
+    parser.add_argument('--legacy-max-rows', type=int, default=20000,
+                        help="Chạy hàm cũ tối đa trên N dòng; lớn hơn thì ngoại suy theo độ phức tạp")
+    parser.add_argument('--by', default=None, help="Cột nhóm để tính quantile theo nhóm (vd. region)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    base = load(['stats.{scope}.damage_percentile_sum', 'stats.{scope}.board_strength_percentile_sum',
+                 'summoner_region', 'winrate', 'avg_placement']).dropna().rename(columns={
+        'stats.{scope}.damage_percentile_sum': 'damage',
+        'stats.{scope}.board_strength_percentile_sum': 'board_strength',
+        'summoner_region': 'region',
+    })
+    rng = np.random.default_rng(args.seed)
+
+    print(f"{'Ruleset':<12} {'Rows':>10} {'Legacy (s)':>14} {'Vectorized (s)':>15} {'Speedup':>10}  Khớp")
+    print("-" * 72)
+    for size in (int(s) for s in args.sizes.split(',')):
+        frame = sample_frame(base, size, rng)
+        for name, ruleset, legacy, exponent in CASES:
+            vec_time, result = timed(classify, frame, ruleset)
+            legacy_rows = min(size, args.legacy_max_rows)
+            sample = frame.iloc[:legacy_rows]
+            legacy_time, legacy_result = timed(legacy, sample)
+            if legacy_rows == size:
+                matches = 'có' if (legacy_result == result).all() else 'KHÔNG'
+                legacy_label = f"{legacy_time:.3f}"
+            else:
+                matches = 'có' if (legacy_result == classify(sample, ruleset)).all() else 'KHÔNG'
+                legacy_time *= (size / legacy_rows) ** exponent
+                legacy_label = f"~{legacy_time:.1f}*"
+            print(f"{name:<12} {size:>10} {legacy_label:>14} {vec_time:>15.4f} {legacy_time / vec_time:>9.0f}x  {matches}")
+        if args.by:
+            by_time, _ = timed(classify, frame, PLAYSTYLES, by=args.by)
+            print(f"{'playstyle/' + args.by:<12} {size:>10} {'-':>14} {by_time:>15.4f} {'-':>10}")
+    print("\n* ngoại suy từ mẫu --legacy-max-rows dòng (playstyle cũ là O(n²), performance là O(n))")
+
+
+if __name__ == '__main__':
+    main()
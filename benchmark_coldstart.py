@@ -0,0 +1,59 @@
+import argparse
+import re
+import subprocess
+import sys
+import time
+
+from run_all_analysis import select_analyses
+
+HEAVY_PACKAGES = ['pandas', 'numpy', 'plotly', 'folium', 'networkx', 'wordcloud', 'matplotlib', 'scipy']
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)')
+
+
+def import_time_by_package(stderr):
+    self_time = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            package = match.group(3).split('.')[0]
+            self_time[package] = self_time.get(package, 0) + int(match.group(1))
+    return self_time
+
+
+def cold_run(args, repeat):
+    best = float('inf')
+    stderr = ''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime', *args],
+                              capture_output=True, text=True, encoding='utf-8')
+        best = min(best, time.perf_counter() - start)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{' '.join(args)} thất bại:\n{proc.stdout[-2000:]}")
+        stderr = proc.stderr
+    return best, import_time_by_package(stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Đo thời gian khởi động lạnh khi chạy một phân tích")
+    parser.add_argument('--only', default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    wall, imports = cold_run(['-c', 'import run_all_analysis'], args.repeat)
+    heavy = {pkg: imports[pkg] for pkg in HEAVY_PACKAGES if pkg in imports}
+    print(f"import run_all_analysis: {wall:.2f}s - "
+          f"{', '.join(f'{pkg} {us / 1000:.0f}ms' for pkg, us in heavy.items()) or 'không có thư viện nặng'}")
+
+    print(f"\n{'Phân tích':<16} {'Cold run (s)':>12} {'Import (ms)':>12}  Thư viện nặng được import")
+    print("-" * 90)
+    for name in select_analyses(args.only):
+        wall, imports = cold_run(['run_all_analysis.py', '--only', name, '--force'], args.repeat)
+        heavy = {pkg: imports[pkg] for pkg in HEAVY_PACKAGES if pkg in imports}
+        print(f"{name:<16} {wall:>12.2f} {sum(heavy.values()) / 1000:>12.0f}  "
+              f"{', '.join(f'{pkg} ({us / 1000:.0f})' for pkg, us in heavy.items())}")
+
+
+if __name__ == '__main__':
+    main()
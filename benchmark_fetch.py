@@ -0,0 +1,119 @@
+import argparse
+import hashlib
+import json
+import random
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from snapshot_archive import load_json
+from tft_leaderboard_fetch import ResponseCache, fetch_ladder
+
+
+def load_records(path, total):
+    data = load_json(path)
+    base = data["data"] if isinstance(data, dict) and "data" in data else data
+    records = []
+    for i in range(total):
+        rec = dict(base[i % len(base)])
+        rec["puuid"] = f"{rec['puuid']}-{i // len(base)}"
+        rec["rank"] = i + 1
+        records.append(rec)
+    return records
+
+
+def make_handler(records, latency, error_rate, overlap):
+    class CannedLadderHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlsplit(self.path).query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["1000"])[0])
+            if latency:
+                time.sleep(latency)
+            if error_rate and random.random() < error_rate:
+                self.send_response(503)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+            start = max(0, offset - overlap)
+            page = records[start:offset + limit]
+            body = json.dumps({
+                "meta": {"total": len(page), "offset": offset, "limit": limit},
+                "data": page,
+            }, ensure_ascii=False).encode("utf-8")
+            etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return CannedLadderHandler
+
+
+def start_server(records, latency=0.0, error_rate=0.0, overlap=0):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(records, latency, error_rate, overlap))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Đo throughput của fetch_ladder trên server giả lập cục bộ")
+    parser.add_argument("--input", default="data/leaderboard.json")
+    parser.add_argument("--pages", default="1,4,16,64")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=0, help="0 = không giới hạn")
+    parser.add_argument("--latency", type=float, default=0.05, help="Độ trễ giả lập mỗi request (giây)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Tỉ lệ trả về 503 để kiểm tra retry")
+    parser.add_argument("--cache", action="store_true",
+                        help="Đo thêm trường hợp có cache: request có điều kiện (304) và TTL còn hạn")
+    parser.add_argument("--overlap", type=int, default=5, help="Số bản ghi trùng giữa các trang liền kề")
+    args = parser.parse_args()
+
+    page_counts = [int(p) for p in args.pages.split(",")]
+    records = load_records(args.input, max(page_counts) * args.page_size)
+    server = start_server(records, args.latency, args.error_rate, args.overlap)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/tft-leaderboard/v2/global"
+
+    cache_dir = tempfile.mkdtemp(prefix="tft_fetch_cache_")
+    modes = [("cold", None), ("304", ResponseCache(cache_dir, ttl=0)),
+             ("ttl", ResponseCache(cache_dir, ttl=3600))]
+
+    print(f"{'Mode':<6} {'Pages':<8} {'Players':<10} {'Time (s)':<10} {'Pages/s':<10} {'Players/s':<12} {'Unique':<8}")
+    print("-" * 66)
+    try:
+        for pages in page_counts:
+            total = pages * args.page_size
+            if args.cache:
+                fetch_ladder(base_url, total=total, page_size=args.page_size, workers=args.workers,
+                             rate=args.rate, backoff=0.05, cache=modes[1][1])
+            for mode, cache in (modes if args.cache else modes[:1]):
+                start = time.perf_counter()
+                data = fetch_ladder(base_url, total=total, page_size=args.page_size,
+                                    workers=args.workers, rate=args.rate, backoff=0.05, cache=cache)
+                elapsed = time.perf_counter() - start
+                unique = len(data["data"])
+                assert unique == total, f"expected {total} unique players, got {unique}"
+                print(f"{mode:<6} {pages:<8} {total:<10} {elapsed:<10.3f} {pages / elapsed:<10.1f} "
+                      f"{total / elapsed:<12.0f} {unique:<8}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
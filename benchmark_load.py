@@ -0,0 +1,69 @@
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from dataset import CLEANED_CSV, CLEANED_CUBE, CLEANED_PARQUET, TOP_CARRIES_CSV, base_columns, declared_columns, load_cleaned
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def scaled_copies(scale, workdir):
+    if scale == 1:
+        return CLEANED_CSV, CLEANED_PARQUET
+    df = pd.read_parquet(CLEANED_PARQUET) if os.path.exists(CLEANED_PARQUET) else pd.read_csv(CLEANED_CSV)
+    df = pd.concat([df] * scale, ignore_index=True)
+    csv_path = os.path.join(workdir, 'cleaned.csv')
+    parquet_path = os.path.join(workdir, 'cleaned.parquet')
+    df.to_csv(csv_path, index=False)
+    df.to_parquet(parquet_path, index=False)
+    return csv_path, parquet_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="So sánh thời gian load CSV và Parquet cho từng analysis")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=int, default=1, help="Nhân bản dữ liệu N lần để đo khi ladder lớn hơn")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='tft_load_bench_')
+    try:
+        csv_path, parquet_path = scaled_copies(args.scale, workdir)
+        print(f"CSV: {os.path.getsize(csv_path) / 1024:.0f} KiB | Parquet: {os.path.getsize(parquet_path) / 1024:.0f} KiB")
+        print(f"\n{'Analysis':<28} {'Cols':<5} {'CSV full (ms)':<14} {'CSV cols (ms)':<14} "
+              f"{'Parquet (ms)':<13} {'Speedup':<8} {'Mem full (KiB)':<15} {'Mem cols (KiB)':<15}")
+        print("-" * 115)
+        skipped = []
+        for script in sorted(glob.glob('analysis_*.py')):
+            columns = base_columns(declared_columns(script))
+            if not columns:
+                skipped.append(script)
+                continue
+            csv_full, df_full = best_of(lambda: pd.read_csv(csv_path), args.repeat)
+            csv_cols, _ = best_of(lambda: load_cleaned(columns, 'csv', csv_path, parquet_path), args.repeat)
+            parquet, df_cols = best_of(lambda: load_cleaned(columns, 'parquet', csv_path, parquet_path), args.repeat)
+            mem_full = df_full.memory_usage(deep=True).sum() / 1024
+            mem_cols = df_cols.memory_usage(deep=True).sum() / 1024
+            print(f"{script:<28} {len(df_cols.columns):<5} {csv_full * 1000:<14.2f} {csv_cols * 1000:<14.2f} "
+                  f"{parquet * 1000:<13.2f} {csv_full / parquet:<8.1f} {mem_full:<15.0f} {mem_cols:<15.0f}")
+        if skipped:
+            print(f"\nBỏ qua {len(skipped)} analysis có COLUMNS rỗng (đọc {CLEANED_CUBE} / {TOP_CARRIES_CSV}, "
+                  f"không đọc bảng cleaned): {', '.join(skipped)}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import contextlib
+import gc
+import importlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import dataset
+from clean_data import clean_file
+from json_to_csv import DECLARED_FIELDNAMES, convert_json_to_csv
+from run_all_analysis import ANALYSES, select_analyses
+from synthetic_leaderboard import parse_sizes, write_snapshot
+
+OUTPUT = 'data/benchmarks/stages.json'
+BASELINE = 'data/benchmarks/stages_baseline.json'
+
+
+def measure(fn, trace=True):
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    error = None
+    try:
+        fn()
+    except Exception as e:
+        error = str(e)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {'wall': wall, 'cpu': cpu, 'peak_mb': peak / (1024 * 1024), 'error': error}
+
+
+def run_analysis_in(workdir, name, context):
+    module = importlib.import_module(ANALYSES[name]['module'])
+    dataset.reset_context(context)
+    cwd = os.getcwd()
+    os.makedirs(os.path.join(workdir, 'visualizations'), exist_ok=True)
+    os.chdir(workdir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.run()
+    finally:
+        os.chdir(cwd)
+
+
+def run_size(n, seed, workdir, analyses, trace, warmup=False):
+    paths = {name: os.path.join(workdir, name) for name in (
+        'leaderboard.json', 'leaderboard.csv', 'top_carries.csv', 'champions.csv',
+        'leaderboard_cleaned.csv', 'leaderboard_cleaned.parquet', 'leaderboard_cube.csv')}
+    stages = [
+        ('generate', lambda: write_snapshot(paths['leaderboard.json'], n, seed)),
+        ('json_to_csv', lambda: convert_json_to_csv(paths['leaderboard.json'], paths['leaderboard.csv'],
+                                                    DECLARED_FIELDNAMES, paths['top_carries.csv'],
+                                                    paths['champions.csv'])),
+        ('clean', lambda: clean_file(paths['leaderboard.csv'], paths['leaderboard_cleaned.csv'],
+                                     paths['leaderboard_cleaned.parquet'],
+                                     output_cube=paths['leaderboard_cube.csv'])),
+    ]
+    for name in analyses:
+        context = dataset.DatasetContext(csv_path=paths['leaderboard_cleaned.csv'],
+                                         parquet_path=paths['leaderboard_cleaned.parquet'],
+                                         carries_path=paths['top_carries.csv'],
+                                         champions_path=paths['champions.csv'],
+                                         cube_path=paths['leaderboard_cube.csv'])
+        stages.append((f'analysis:{name}',
+                       lambda name=name, context=context: run_analysis_in(workdir, name, context)))
+
+    results = []
+    for stage, fn in stages:
+        if warmup and stage.startswith('analysis:'):
+            with contextlib.suppress(Exception):
+                fn()
+        result = {'size': n, 'stage': stage}
+        result.update(measure(fn, trace))
+        results.append(result)
+        status = f"LỖI: {result['error']}" if result['error'] else 'OK'
+        print(f"  {stage:<28} {result['wall']:>8.2f} s  {result['peak_mb']:>9.1f} MiB  {status}", flush=True)
+    dataset.reset_context()
+    return results
+
+
+def compare(results, baseline, threshold, min_wall, min_mb):
+    previous = {(r['size'], r['stage']): r for r in baseline.get('results', [])}
+    regressions = 0
+    for result in results:
+        base = previous.get((result['size'], result['stage']))
+        result['regressions'] = []
+        if base is None:
+            result['baseline_wall'] = None
+            continue
+        result['baseline_wall'] = base['wall']
+        if result['wall'] > base['wall'] * (1 + threshold) and result['wall'] - base['wall'] > min_wall:
+            result['regressions'].append('wall')
+        if result['peak_mb'] > base['peak_mb'] * (1 + threshold) and result['peak_mb'] - base['peak_mb'] > min_mb:
+            result['regressions'].append('memory')
+        regressions += bool(result['regressions'])
+    return regressions
+
+
+def print_report(results):
+    print(f"\n{'Size':>8} {'Stage':<28} {'Wall (s)':>9} {'CPU (s)':>9} {'Peak MiB':>9} {'vs base':>8}  Flag")
+    print("-" * 84)
+    for r in results:
+        ratio = f"x{r['wall'] / r['baseline_wall']:.2f}" if r.get('baseline_wall') else '-'
+        flags = ', '.join(r.get('regressions', [])) or ('LỖI' if r['error'] else '')
+        print(f"{r['size']:>8} {r['stage']:<28} {r['wall']:>9.2f} {r['cpu']:>9.2f} {r['peak_mb']:>9.1f} "
+              f"{ratio:>8}  {flags}")
+
+
+def write_json(path, payload):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark từng stage của pipeline trên leaderboard giả lập")
+    parser.add_argument('--sizes', type=parse_sizes, default='1k,10k,100k', help="Kích thước ladder, vd. 1k,20k,100k,1m")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', default=None, help="Chỉ benchmark các phân tích này (cách nhau bởi dấu phẩy)")
+    parser.add_argument('--no-tracemalloc', action='store_true',
+                        help="Tắt đo bộ nhớ (tracemalloc làm chậm các stage thuần Python)")
+    parser.add_argument('--output', default=OUTPUT)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="Ghi kết quả lần chạy này làm baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Tỉ lệ chậm/tốn bộ nhớ hơn baseline bị coi là regression")
+    parser.add_argument('--min-wall', type=float, default=0.05, help="Bỏ qua chênh lệch thời gian nhỏ hơn N giây")
+    parser.add_argument('--min-mb', type=float, default=1.0, help="Bỏ qua chênh lệch bộ nhớ nhỏ hơn N MiB")
+    parser.add_argument('--no-warmup', action='store_true',
+                        help="Không chạy khởi động các phân tích (lần đo đầu sẽ gồm cả thời gian import thư viện)")
+    parser.add_argument('--keep', action='store_true', help="Giữ lại thư mục dữ liệu tạm")
+    args = parser.parse_args(argv)
+
+    try:
+        analyses = select_analyses(args.only)
+    except ValueError as e:
+        print(e)
+        return 2
+
+    results = []
+    for i, n in enumerate(args.sizes):
+        workdir = tempfile.mkdtemp(prefix=f'tft_stages_{n}_')
+        print(f"\n=== {n} người chơi ({workdir}) ===")
+        try:
+            results.extend(run_size(n, args.seed, workdir, analyses, not args.no_tracemalloc,
+                                   warmup=i == 0 and not args.no_warmup))
+        finally:
+            if not args.keep:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('tracemalloc') != (not args.no_tracemalloc):
+            print(f"\nBaseline {args.baseline} đo với chế độ tracemalloc khác - bỏ qua so sánh")
+            baseline = {}
+    regressions = compare(results, baseline, args.threshold, args.min_wall, args.min_mb)
+    print_report(results)
+
+    payload = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'tracemalloc': not args.no_tracemalloc,
+        'results': results,
+    }
+    write_json(args.output, payload)
+    print(f"\nĐã lưu kết quả vào {args.output}")
+    if args.save_baseline:
+        write_json(args.baseline, payload)
+        print(f"Đã lưu baseline vào {args.baseline}")
+    elif baseline:
+        print(f"So với baseline {args.baseline}: {regressions} regression")
+    failed = sum(1 for r in results if r['error'])
+    return 1 if regressions or failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import ast
+import hashlib
+import json
+import os
+import time
+
+MANIFEST = 'visualizations/.build_manifest.json'
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def local_sources(module_name, root='.'):
+    seen = []
+    pending = [module_name]
+    while pending:
+        name = pending.pop()
+        path = os.path.join(root, name + '.py')
+        if name in seen or not os.path.exists(path):
+            continue
+        seen.append(name)
+        with open(path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module.split('.')[0])
+    return sorted(os.path.join(root, name + '.py') for name in seen)
+
+
+def build_key(module_name, inputs, params=None):
+    digest = hashlib.sha256()
+    for path in local_sources(module_name):
+        digest.update(f"src:{path}:{file_digest(path)}\n".encode('utf-8'))
+    for path in sorted(inputs):
+        digest.update(f"in:{path}:{file_digest(path)}\n".encode('utf-8'))
+    digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class BuildCache:
+    def __init__(self, path=MANIFEST):
+        self.path = path
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def lookup(self, name, key, outputs):
+        entry = self.entries.get(name)
+        if entry is None or entry.get('key') != key:
+            return None
+        if not all(os.path.exists(path) for path in outputs):
+            return None
+        return entry
+
+    def record(self, name, key, outputs, wall):
+        self.entries[name] = {
+            'key': key,
+            'outputs': list(outputs),
+            'wall': wall,
+            'built_at': time.time(),
+        }
+
+    def invalidate(self, names=None):
+        if names is None:
+            self.entries.clear()
+        for name in names or []:
+            self.entries.pop(name, None)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
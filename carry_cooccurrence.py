@@ -0,0 +1,119 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+PLAYER_COLUMNS = ['puuid', 'summoner_region', 'rating_numeric']
+
+
+def player_mask(players, regions=None, rating_band=None):
+    mask = np.ones(len(players), dtype=bool)
+    if regions is not None:
+        mask &= players['summoner_region'].isin(regions).to_numpy()
+    if rating_band is not None:
+        low, high = rating_band
+        rating = players['rating_numeric'].to_numpy()
+        if low is not None:
+            mask &= rating >= low
+        if high is not None:
+            mask &= rating < high
+    return mask
+
+
+def filter_carries(carries, players=None, regions=None, rating_band=None):
+    if regions is None and rating_band is None:
+        return carries
+    if players is None:
+        raise ValueError("players (puuid, summoner_region, rating_numeric) is required for region/rating filters")
+    return carries[carries['puuid'].isin(players.loc[player_mask(players, regions, rating_band), 'puuid'])]
+
+
+def incidence_matrix(carries, n_champions=None):
+    player_codes, puuids = pd.factorize(carries['puuid'])
+    champion_ids = carries['champion_id'].to_numpy()
+    if n_champions is None:
+        n_champions = len(carries['champion'].cat.categories) if 'champion' in carries else champion_ids.max() + 1
+    X = sparse.csr_matrix(
+        (np.ones(len(carries), dtype=np.int32), (player_codes, champion_ids)),
+        shape=(len(puuids), n_champions)
+    )
+    X.sum_duplicates()
+    X.data[:] = 1
+    return X, puuids
+
+
+def cooccurrence(carries, players=None, regions=None, rating_band=None,
+                 min_count=1, min_lift=None, min_pmi=None):
+    carries = filter_carries(carries, players, regions, rating_band)
+    names = np.asarray(carries['champion'].cat.categories)
+    X, puuids = incidence_matrix(carries, len(names))
+    if players is not None:
+        n_players = players.loc[player_mask(players, regions, rating_band), 'puuid'].nunique()
+        population = 'all'
+    else:
+        n_players = X.shape[0]
+        population = 'carriers'
+
+    C = (X.T @ X).tocsr()
+    support = C.diagonal()
+    upper = sparse.triu(C, k=1).tocoo()
+
+    count = upper.data.astype(np.int64)
+    expected = support[upper.row].astype(np.float64) * support[upper.col] / max(n_players, 1)
+    lift = count / expected
+    pairs = pd.DataFrame({
+        'champion_a': names[upper.row],
+        'champion_b': names[upper.col],
+        'count': count,
+        'support_a': support[upper.row],
+        'support_b': support[upper.col],
+        'lift': lift,
+        'pmi': np.log2(lift),
+    })
+
+    keep = pairs['count'] >= min_count
+    if min_lift is not None:
+        keep &= pairs['lift'] >= min_lift
+    if min_pmi is not None:
+        keep &= pairs['pmi'] >= min_pmi
+    pairs = pairs[keep].sort_values(['count', 'lift'], ascending=False, kind='stable')
+    pairs.attrs['n_players'] = n_players
+    pairs.attrs['population'] = population
+    return pairs.reset_index(drop=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ma trận đồng xuất hiện tướng carry (sparse)")
+    parser.add_argument('--scope', default='RecentResult')
+    parser.add_argument('--region', default=None, help="Lọc theo khu vực, cách nhau bởi dấu phẩy (vd. kr,euw1)")
+    parser.add_argument('--rating-min', type=float, default=None)
+    parser.add_argument('--rating-max', type=float, default=None)
+    parser.add_argument('--min-count', type=int, default=1)
+    parser.add_argument('--min-lift', type=float, default=None)
+    parser.add_argument('--min-pmi', type=float, default=None)
+    parser.add_argument('--top', type=int, default=30)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from dataset import load, load_carries
+
+    args = parse_args(argv)
+    regions = args.region.split(',') if args.region else None
+    rating_band = None
+    if args.rating_min is not None or args.rating_max is not None:
+        rating_band = (args.rating_min, args.rating_max)
+
+    pairs = cooccurrence(load_carries(args.scope), load(PLAYER_COLUMNS), regions, rating_band,
+                         args.min_count, args.min_lift, args.min_pmi)
+
+    print(f"Số người chơi (mẫu số của lift): {pairs.attrs['n_players']} | Số cặp tướng: {len(pairs)}")
+    print(f"\n{'Champion A':<16} {'Champion B':<16} {'Count':>7} {'Lift':>7} {'PMI':>7}")
+    print("-" * 57)
+    for row in pairs.head(args.top).itertuples():
+        print(f"{row.champion_a:<16} {row.champion_b:<16} {row.count:>7} {row.lift:>7.2f} {row.pmi:>7.2f}")
+
+
+if __name__ == '__main__':
+    main()
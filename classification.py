@@ -0,0 +1,84 @@
+import operator
+
+import numpy as np
+import pandas as pd
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+}
+
+
+class Quantile:
+    def __init__(self, q):
+        self.q = q
+
+    def __repr__(self):
+        return f"Quantile({self.q})"
+
+
+MEDIAN = Quantile(0.5)
+
+PERFORMANCE_TIERS = {
+    'rules': [
+        ('Elite', {'winrate': ('>=', 25), 'avg_placement': ('<=', 3.5)}),
+        ('High Performer', {'winrate': ('>=', 20), 'avg_placement': ('<=', 4.0)}),
+        ('Above Average', {'winrate': ('>=', 15), 'avg_placement': ('<=', 4.5)}),
+    ],
+    'default': 'Average',
+}
+
+PLAYSTYLES = {
+    'rules': [
+        ('High Tempo (Aggressive)', {'damage': ('>', MEDIAN), 'board_strength': ('>', MEDIAN)}),
+        ('Eco (Conservative)', {'damage': ('<', MEDIAN), 'board_strength': ('<', MEDIAN)}),
+        ('Damage Focus', {'damage': ('>', MEDIAN)}),
+    ],
+    'default': 'Board Strength Focus',
+}
+
+
+def labels(ruleset):
+    return [label for label, _ in ruleset['rules']] + [ruleset['default']]
+
+
+def cut_points(df, ruleset, by=None):
+    needed = {}
+    for _, conditions in ruleset['rules']:
+        for col, (_, threshold) in conditions.items():
+            if isinstance(threshold, Quantile):
+                needed.setdefault(col, set()).add(threshold.q)
+
+    points = {}
+    for col, qs in needed.items():
+        qs = sorted(qs)
+        if by is None:
+            values = df[col].quantile(qs)
+            for q in qs:
+                points[(col, q)] = values.loc[q]
+        else:
+            values = df.groupby(by)[col].quantile(qs).unstack()
+            for q in qs:
+                points[(col, q)] = df[by].map(values[q]).to_numpy()
+    return points
+
+
+def classify(df, ruleset, by=None):
+    points = cut_points(df, ruleset, by)
+    arrays = {}
+    conditions = []
+    for _, rule in ruleset['rules']:
+        mask = np.ones(len(df), dtype=bool)
+        for col, (op, threshold) in rule.items():
+            if col not in arrays:
+                arrays[col] = df[col].to_numpy()
+            if isinstance(threshold, Quantile):
+                threshold = points[(col, threshold.q)]
+            mask &= OPERATORS[op](arrays[col], threshold)
+        conditions.append(mask)
+    choices = [label for label, _ in ruleset['rules']]
+    return pd.Series(np.select(conditions, choices, default=ruleset['default']).astype(object),
+                     index=df.index)
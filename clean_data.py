@@ -0,0 +1,164 @@
+import argparse
+
+import pandas as pd
+
+import aggregate_cube
+from dataset import CLEANED_CSV, CLEANED_CUBE, CLEANED_PARQUET, DEFAULT_SCOPE, project
+from json_to_csv import is_up_to_date
+
+RAW_CSV = 'data/leaderboard.csv'
+
+INTEGER_COLUMNS = ['rank', 'rating_numeric', 'num_played', 'player_id']
+STRING_COLUMNS = ['summoner_region', 'riot_id', 'puuid', 'rating']
+LIVE_NUMERIC_COLUMNS = ['live.game_start_time', 'live.player_id']
+
+INT_PATTERNS = ('ItemData', 'num_played', 'place_sum', 'wins', 'percentile_count',
+                'percentile_sum', 'lpChange')
+FLOAT_PATTERNS = ('avg_similarity',)
+
+FILL_VALUES = {
+    'int': 0,
+    'float': 0.0,
+    'str': '',
+    'list': '[]',
+}
+
+
+def column_kind(col):
+    if col in INTEGER_COLUMNS:
+        return 'int'
+    if col in STRING_COLUMNS:
+        return 'str'
+    if col.startswith('live.'):
+        return 'float' if col in LIVE_NUMERIC_COLUMNS else 'str'
+    if 'topCarries' in col:
+        return 'list'
+    if any(x in col for x in FLOAT_PATTERNS):
+        return 'float'
+    if any(x in col for x in INT_PATTERNS):
+        return 'int'
+    return None
+
+
+def build_schema(columns):
+    return {col: column_kind(col) for col in columns}
+
+
+def read_dtypes(schema):
+    return {col: str for col, kind in schema.items() if kind in ('str', 'list')}
+
+
+def clean_frame(df, schema=None):
+    schema = schema or build_schema(df.columns)
+    by_kind = {}
+    for col in df.columns:
+        by_kind.setdefault(schema.get(col), []).append(col)
+
+    numeric = by_kind.get('int', []) + by_kind.get('float', [])
+    to_coerce = [col for col in numeric if not pd.api.types.is_numeric_dtype(df[col])]
+    if to_coerce:
+        df[to_coerce] = df[to_coerce].apply(pd.to_numeric, errors='coerce')
+
+    fill = {col: FILL_VALUES[kind] for kind, cols in by_kind.items() if kind for col in cols}
+    for col in by_kind.get(None, []):
+        if pd.api.types.is_numeric_dtype(df[col]):
+            fill[col] = 0
+        elif df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
+            fill[col] = ''
+    df = df.fillna(fill)
+
+    casts = {col: 'int64' for col in by_kind.get('int', [])}
+    casts.update({col: 'float64' for col in by_kind.get('float', [])})
+    casts.update({col: str for kind in ('str', 'list') for col in by_kind.get(kind, [])})
+    return df.astype(casts)
+
+
+def missing_report(df):
+    missing = df.isnull().sum()
+    return missing[missing > 0].sort_values(ascending=False)
+
+
+def clean_file(input_file=RAW_CSV, output_csv=CLEANED_CSV, output_parquet=CLEANED_PARQUET,
+               chunksize=None, output_cube=CLEANED_CUBE):
+    header = pd.read_csv(input_file, nrows=0).columns
+    schema = build_schema(header)
+    dtypes = read_dtypes(schema)
+
+    if not chunksize:
+        df = pd.read_csv(input_file, dtype=dtypes)
+        missing_before = missing_report(df)
+        df = clean_frame(df, schema)
+        df.to_csv(output_csv, index=False)
+        if output_parquet:
+            df.to_parquet(output_parquet, index=False)
+        if output_cube:
+            aggregate_cube.write_cube(aggregate_cube.build(project(df, aggregate_cube.COLUMNS, DEFAULT_SCOPE)),
+                                      output_cube)
+        return len(df), missing_before, int(df.isnull().sum().sum())
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    missing_before = None
+    missing_after = 0
+    cubes = []
+    writer = None
+    try:
+        for i, chunk in enumerate(pd.read_csv(input_file, dtype=dtypes, chunksize=chunksize)):
+            chunk_missing = chunk.isnull().sum()
+            missing_before = chunk_missing if missing_before is None else missing_before + chunk_missing
+            chunk = clean_frame(chunk, schema)
+            missing_after += int(chunk.isnull().sum().sum())
+            chunk.to_csv(output_csv, index=False, mode='w' if i == 0 else 'a', header=i == 0)
+            if output_parquet:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_parquet, table.schema)
+                writer.write_table(table.cast(writer.schema))
+            if output_cube:
+                cubes.append(aggregate_cube.build(project(chunk, aggregate_cube.COLUMNS, DEFAULT_SCOPE)))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if missing_before is None:
+        return clean_file(input_file, output_csv, output_parquet, None, output_cube)
+    if output_cube:
+        aggregate_cube.write_cube(aggregate_cube.merge(cubes), output_cube)
+    missing_before = missing_before[missing_before > 0].sort_values(ascending=False)
+    return rows, missing_before, missing_after
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Làm sạch dữ liệu leaderboard (thay cho cleandata.ipynb)")
+    parser.add_argument('--input', default=RAW_CSV)
+    parser.add_argument('--output', default=CLEANED_CSV)
+    parser.add_argument('--parquet', default=CLEANED_PARQUET, help="Đường dẫn Parquet ('' để bỏ qua)")
+    parser.add_argument('--cube', default=CLEANED_CUBE,
+                        help="Đường dẫn cube tổng hợp region × tier × rating band ('' để bỏ qua)")
+    parser.add_argument('--chunksize', type=int, default=None, help="Xử lý theo từng khối N dòng")
+    parser.add_argument('--force', action='store_true', help="Làm sạch lại kể cả khi output đã mới hơn input")
+    args = parser.parse_args(argv)
+
+    if not args.force and is_up_to_date(args.input, args.output):
+        print(f"{args.output} đã cập nhật - bỏ qua")
+        return
+
+    rows, missing_before, missing_after = clean_file(args.input, args.output, args.parquet or None,
+                                                     args.chunksize, args.cube or None)
+    print("=== CÁC CỘT CÓ GIÁ TRỊ THIẾU (trước khi làm sạch) ===")
+    if len(missing_before) > 0:
+        print(missing_before.to_string())
+    else:
+        print("Không có giá trị thiếu!")
+    print(f"\nTổng số giá trị thiếu sau khi làm sạch: {missing_after}")
+    print(f"✓ Đã lưu dữ liệu đã làm sạch vào: {args.output} ({rows} dòng)")
+    if args.parquet:
+        print(f"✓ Đã lưu bản Parquet vào: {args.parquet}")
+    if args.cube:
+        print(f"✓ Đã lưu cube tổng hợp vào: {args.cube}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+import ast
+import os
+import time
+
+import pandas as pd
+
+CLEANED_CSV = 'data/leaderboard_cleaned.csv'
+CLEANED_PARQUET = 'data/leaderboard_cleaned.parquet'
+TOP_CARRIES_CSV = 'data/top_carries.csv'
+CHAMPIONS_CSV = 'data/champions.csv'
+CLEANED_CUBE = 'data/leaderboard_cube.csv'
+
+# Columns may be declared with placeholders: 'stats.{scope}.…' is the per-scope
+# block (ItemData, avg_similarity, percentiles, topCarries) and '{results}.…' the
+# wins/num_played/place_sum used for winrate and placement. The API has no
+# season-wide per-scope block, so 'overall' pairs season results with RecentResult.
+SCOPES = {
+    'overall': {'scope': 'RecentResult', 'results': 'stats'},
+    'RecentResult': {'scope': 'RecentResult', 'results': 'stats.RecentResult'},
+    'currentPatchResult': {'scope': 'currentPatchResult', 'results': 'stats.currentPatchResult'},
+}
+DEFAULT_SCOPE = 'overall'
+
+DERIVED_COLUMNS = {
+    'winrate': (['{results}.wins', '{results}.num_played'],
+                lambda wins, num_played: wins / num_played * 100),
+    'avg_placement': (['{results}.place_sum', '{results}.num_played'],
+                      lambda place_sum, num_played: place_sum / num_played),
+}
+
+_scope = DEFAULT_SCOPE
+
+
+def set_scope(scope):
+    global _scope
+    if scope not in SCOPES:
+        raise ValueError(f"Không có scope: {scope} (có: {', '.join(SCOPES)})")
+    _scope = scope
+
+
+def get_scope():
+    return _scope
+
+
+def resolve(column, scope=None):
+    return column.format(**SCOPES[scope or _scope]) if '{' in column else column
+
+
+def project(frame, columns, scope=None):
+    return pd.DataFrame({col: frame[resolve(col, scope)] for col in columns})
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_source(source='auto', parquet_path=CLEANED_PARQUET):
+    if source == 'auto':
+        return 'parquet' if os.path.exists(parquet_path) and parquet_available() else 'csv'
+    return source
+
+
+def base_columns(columns, scope=None):
+    base = []
+    for col in columns:
+        for dep in DERIVED_COLUMNS[col][0] if col in DERIVED_COLUMNS else [col]:
+            dep = resolve(dep, scope)
+            if dep not in base:
+                base.append(dep)
+    return base
+
+
+def declared_columns(script_path):
+    with open(script_path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), script_path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'COLUMNS' for t in node.targets):
+            return ast.literal_eval(node.value)
+    return []
+
+
+def load_cleaned(columns=None, source='auto', csv_path=CLEANED_CSV, parquet_path=CLEANED_PARQUET):
+    if resolve_source(source, parquet_path) == 'parquet':
+        return pd.read_parquet(parquet_path, columns=columns)
+    return pd.read_csv(csv_path, usecols=columns)
+
+
+def load_top_carries(scope=None, carries_path=TOP_CARRIES_CSV, champions_path=CHAMPIONS_CSV):
+    carries = pd.read_csv(carries_path, dtype={
+        'puuid': str,
+        'scope': 'category',
+        'champion_id': 'int32',
+        'count': 'int32',
+        'avg': 'float64',
+    })
+    if scope is not None:
+        carries = carries[carries['scope'] == scope].reset_index(drop=True)
+    names = pd.read_csv(champions_path).sort_values('champion_id')['name']
+    carries['champion'] = pd.Categorical.from_codes(carries['champion_id'], categories=names.tolist())
+    return carries
+
+
+class DatasetContext:
+    def __init__(self, source='auto', csv_path=CLEANED_CSV, parquet_path=CLEANED_PARQUET,
+                 carries_path=TOP_CARRIES_CSV, champions_path=CHAMPIONS_CSV, cube_path=CLEANED_CUBE):
+        self.source = resolve_source(source, parquet_path)
+        self.csv_path = csv_path
+        self.parquet_path = parquet_path
+        self.carries_path = carries_path
+        self.champions_path = champions_path
+        self.cube_path = cube_path
+        self._columns = {}
+        self._cubes = {}
+        self._carries = {}
+        self._all_loaded = False
+        self.loads = 0
+        self.load_time = 0.0
+
+    def _load(self, columns):
+        start = time.perf_counter()
+        if self.source == 'parquet':
+            frame = load_cleaned(columns, 'parquet', self.csv_path, self.parquet_path)
+        else:
+            frame = load_cleaned(None, 'csv', self.csv_path, self.parquet_path)
+            self._all_loaded = True
+        for col in frame.columns:
+            self._columns.setdefault(col, frame[col])
+        self.loads += 1
+        self.load_time += time.perf_counter() - start
+
+    @property
+    def loaded_columns(self):
+        return list(self._columns)
+
+    def preload(self, columns, scope=None):
+        missing = [c for c in base_columns(columns, scope) if c not in self._columns]
+        if missing and not self._all_loaded:
+            self._load(missing)
+
+    def column(self, name, scope=None):
+        if name in DERIVED_COLUMNS:
+            deps, compute = DERIVED_COLUMNS[name]
+            deps = [resolve(dep, scope) for dep in deps]
+            key = f"{name}@{resolve('{results}', scope)}"
+            if key not in self._columns:
+                self.preload(deps)
+                self._columns[key] = compute(*(self._columns[dep] for dep in deps)).rename(name)
+            return self._columns[key]
+        name = resolve(name, scope)
+        if name not in self._columns:
+            self.preload([name])
+        return self._columns[name]
+
+    def top_carries(self, scope='RecentResult'):
+        if scope not in self._carries:
+            start = time.perf_counter()
+            self._carries[scope] = load_top_carries(scope, self.carries_path, self.champions_path)
+            self.loads += 1
+            self.load_time += time.perf_counter() - start
+        return self._carries[scope].copy()
+
+    def data_path(self):
+        return self.parquet_path if self.source == 'parquet' else self.csv_path
+
+    def cube(self, scope=None):
+        scope = scope or _scope
+        if scope not in self._cubes:
+            import aggregate_cube
+
+            start = time.perf_counter()
+            fresh = (scope == DEFAULT_SCOPE and self.cube_path and os.path.exists(self.cube_path)
+                     and os.path.getmtime(self.cube_path) >= os.path.getmtime(self.data_path()))
+            if fresh:
+                self._cubes[scope] = aggregate_cube.read_cube(self.cube_path)
+                self.loads += 1
+                self.load_time += time.perf_counter() - start
+            else:
+                self._cubes[scope] = aggregate_cube.build(self.view(aggregate_cube.COLUMNS, scope))
+        return self._cubes[scope]
+
+    def view(self, columns, scope=None):
+        self.preload(columns, scope)
+        return pd.DataFrame({col: self.column(col, scope) for col in columns})
+
+
+_context = None
+
+
+def get_context():
+    global _context
+    if _context is None:
+        _context = DatasetContext()
+    return _context
+
+
+def reset_context(context=None):
+    global _context
+    _context = context
+    return get_context()
+
+
+def load(columns):
+    return get_context().view(columns)
+
+
+def load_carries(scope=None):
+    return get_context().top_carries(scope or resolve('{scope}'))
+
+
+def load_cube():
+    return get_context().cube()
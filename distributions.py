@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+RAW_MAX_POINTS = 5000
+GRID_BINS = 1024
+CURVE_POINTS = 100
+VIOLIN_HALF_WIDTH = 0.4
+MODES = ('auto', 'raw', 'summary')
+
+_mode = 'auto'
+
+
+def set_mode(mode):
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"Không có chế độ phân phối: {mode} (có: {', '.join(MODES)})")
+    _mode = mode
+
+
+def get_mode():
+    return _mode
+
+
+def use_summaries(n):
+    return _mode == 'summary' or (_mode == 'auto' and n > RAW_MAX_POINTS)
+
+
+def group_codes(keys, groups):
+    return pd.Categorical(keys, categories=groups).codes.astype(np.int64)
+
+
+def group_stats(values, codes, n_groups):
+    order = np.lexsort((values, codes))
+    v = values[order]
+    c = codes[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    last = starts + np.maximum(counts - 1, 0)
+
+    def quantile(q):
+        pos = starts + q * np.maximum(counts - 1, 0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, last)
+        return v[lo] + (v[hi] - v[lo]) * (pos - lo)
+
+    q1, median, q3 = quantile(0.25), quantile(0.5), quantile(0.75)
+    iqr = q3 - q1
+    total = np.bincount(codes, weights=values, minlength=n_groups)
+    mean = total / counts
+    sq = np.bincount(codes, weights=(values - mean[codes]) ** 2, minlength=n_groups)
+    sd = np.sqrt(sq / np.maximum(counts - 1, 1))
+
+    inside_low = np.where(v >= (q1 - 1.5 * iqr)[c], v, np.inf)
+    inside_high = np.where(v <= (q3 + 1.5 * iqr)[c], v, -np.inf)
+    return {
+        'count': counts,
+        'mean': mean,
+        'sd': sd,
+        'min': v[starts],
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'max': v[last],
+        'lowerfence': np.minimum.reduceat(inside_low, starts),
+        'upperfence': np.maximum.reduceat(inside_high, starts),
+    }
+
+
+def kde_curves(values, codes, stats, points=CURVE_POINTS, bins=GRID_BINS):
+    counts = stats['count']
+    spread = np.minimum(stats['sd'], (stats['q3'] - stats['q1']) / 1.349)
+    spread = np.where(spread > 0, spread, np.maximum(stats['sd'], 1e-3 * np.maximum(np.abs(stats['mean']), 1)))
+    bandwidth = 1.059 * spread * counts ** (-1 / 5)
+
+    low = stats['min'] - 2 * bandwidth
+    high = stats['max'] + 2 * bandwidth
+    origin = low.min()
+    width = (high.max() - origin) / (bins - 1)
+    index = np.clip(np.rint((values - origin) / width).astype(np.int64), 0, bins - 1)
+    hist = np.bincount(codes * bins + index, minlength=len(counts) * bins).reshape(len(counts), bins)
+
+    n_fft = 2 * bins
+    freqs = np.fft.rfftfreq(n_fft, d=width)
+    transfer = np.exp(-0.5 * (2 * np.pi * freqs[None, :] * bandwidth[:, None]) ** 2)
+    density = np.fft.irfft(np.fft.rfft(hist, n_fft, axis=1) * transfer, n_fft, axis=1)[:, :bins]
+    density = np.maximum(density, 0) / (counts[:, None] * width)
+
+    grid = low[:, None] + np.linspace(0, 1, points)[None, :] * (high - low)[:, None]
+    pos = (grid - origin) / width
+    lo = np.clip(np.floor(pos).astype(np.int64), 0, bins - 1)
+    hi = np.minimum(lo + 1, bins - 1)
+    frac = pos - lo
+    curve = (np.take_along_axis(density, lo, axis=1) * (1 - frac)
+             + np.take_along_axis(density, hi, axis=1) * frac)
+    return grid, curve
+
+
+def summarize(values, keys=None, groups=None):
+    values = np.asarray(values, dtype=np.float64)
+    if keys is None:
+        codes = np.zeros(len(values), dtype=np.int64)
+        groups = [None]
+    else:
+        codes = group_codes(keys, groups)
+    keep = (codes >= 0) & ~np.isnan(values)
+    values, codes = values[keep], codes[keep]
+    present = np.bincount(codes, minlength=len(groups)) > 0
+    remap = np.cumsum(present) - 1
+    codes = remap[codes]
+    names = [group for group, ok in zip(groups, present) if ok]
+
+    stats = group_stats(values, codes, len(names))
+    grid, curve = kde_curves(values, codes, stats)
+    return {'groups': names, 'stats': stats, 'grid': grid, 'density': curve}
+
+
+def histogram(values, bins=50):
+    values = np.asarray(values, dtype=np.float64)
+    counts, edges = np.histogram(values[~np.isnan(values)], bins=bins)
+    return counts, edges
+
+
+def violin_traces(summary, names=None, colors=None):
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
+    colors = colors or qualitative.Plotly
+    names = names or [str(group) for group in summary['groups']]
+    stats = summary['stats']
+    traces = []
+    for i, name in enumerate(names):
+        color = colors[i % len(colors)]
+        grid = summary['grid'][i]
+        half = summary['density'][i] / summary['density'][i].max() * VIOLIN_HALF_WIDTH
+        traces.append(go.Scatter(
+            x=np.concatenate([i - half, (i + half)[::-1]]),
+            y=np.concatenate([grid, grid[::-1]]),
+            fill='toself',
+            mode='lines',
+            line=dict(color=color, width=1),
+            name=name,
+            hoverinfo='skip',
+            showlegend=False
+        ))
+        traces.append(go.Box(
+            x=[i],
+            q1=[stats['q1'][i]],
+            median=[stats['median'][i]],
+            q3=[stats['q3'][i]],
+            lowerfence=[stats['lowerfence'][i]],
+            upperfence=[stats['upperfence'][i]],
+            mean=[stats['mean'][i]],
+            width=0.12,
+            marker=dict(color=color),
+            line=dict(color=color),
+            fillcolor='white',
+            name=name,
+            hoverinfo='y',
+            showlegend=False
+        ))
+    return traces
@@ -0,0 +1,172 @@
+import html
+import json
+import os
+
+VISUALIZATIONS_DIR = 'visualizations'
+DASHBOARD_DIR = 'visualizations/dashboard'
+CHARTS_DIR = 'visualizations/dashboard/charts'
+MODES = ('standalone', 'dashboard')
+
+_mode = 'standalone'
+_subdir = ''
+
+SHELL = """<!DOCTYPE html>
+<html lang="vi">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="{plotly_js}" defer></script>
+<style>
+body {{ margin: 0; font-family: sans-serif; background: #f5f6f8; }}
+nav {{ display: flex; flex-wrap: wrap; gap: 4px; padding: 8px; background: #1f2937; }}
+nav button {{ border: 0; padding: 8px 14px; border-radius: 4px; background: #374151; color: #e5e7eb; cursor: pointer; }}
+nav button.active {{ background: #2563eb; color: #fff; }}
+section {{ display: none; padding: 12px; }}
+section.active {{ display: block; }}
+.item {{ background: #fff; margin-bottom: 12px; padding: 8px; border-radius: 4px; }}
+.item h3 {{ margin: 4px 0 8px; font-size: 14px; color: #374151; }}
+.item iframe {{ width: 100%; height: 720px; border: 0; }}
+.item img {{ max-width: 100%; }}
+</style>
+</head>
+<body>
+<nav>{buttons}</nav>
+{sections}
+<script>
+const TABS = {tabs};
+const loaded = {{}};
+function dashboardChart(id, fig) {{
+  Plotly.newPlot(document.getElementById('chart-' + id), fig.data, fig.layout, {{responsive: true}});
+}}
+function load(tab) {{
+  if (loaded[tab]) return;
+  loaded[tab] = true;
+  for (const item of TABS[tab]) {{
+    const el = document.getElementById(item.id);
+    if (item.type === 'chart') {{
+      const script = document.createElement('script');
+      script.src = item.src;
+      document.body.appendChild(script);
+    }} else {{
+      el.src = item.src;
+    }}
+  }}
+}}
+function show(tab) {{
+  for (const el of document.querySelectorAll('nav button, section')) {{
+    el.classList.toggle('active', el.dataset.tab === tab);
+  }}
+  load(tab);
+}}
+window.addEventListener('DOMContentLoaded', () => show(Object.keys(TABS)[0]));
+</script>
+</body>
+</html>
+"""
+
+
+def set_mode(mode):
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"Không có chế độ xuất: {mode} (có: {', '.join(MODES)})")
+    _mode = mode
+
+
+def get_mode():
+    return _mode
+
+
+def set_subdir(subdir):
+    global _subdir
+    _subdir = subdir or ''
+
+
+def get_subdir():
+    return _subdir
+
+
+def chart_id(filename):
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def chart_path(filename, mode=None, subdir=None):
+    subdir = _subdir if subdir is None else subdir
+    if (mode or _mode) == 'dashboard':
+        return os.path.join(CHARTS_DIR, subdir, chart_id(filename) + '.js')
+    return os.path.join(VISUALIZATIONS_DIR, subdir, filename)
+
+
+def asset_path(filename, subdir=None):
+    return os.path.join(VISUALIZATIONS_DIR, _subdir if subdir is None else subdir, filename)
+
+
+def output_file(filename):
+    path = asset_path(filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def save_figure(fig, filename):
+    path = chart_path(filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if _mode == 'dashboard':
+        payload = fig.to_json(validate=False)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"dashboardChart({json.dumps(chart_id(filename))}, {payload});\n")
+    else:
+        fig.write_html(path)
+    return path
+
+
+def write_plotly_asset(directory=DASHBOARD_DIR):
+    import plotly
+    from plotly.offline import get_plotlyjs
+
+    name = f'plotly-{plotly.__version__}.min.js'
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+    return name
+
+
+def dashboard_item(filename, subdir='', directory=DASHBOARD_DIR):
+    item_id = chart_id(filename)
+    page = os.path.join(directory, subdir)
+    if os.path.exists(chart_path(filename, 'dashboard', subdir)):
+        src = os.path.relpath(chart_path(filename, 'dashboard', subdir), page)
+        return {'id': f'chart-{item_id}', 'type': 'chart', 'src': src}
+    src = os.path.relpath(asset_path(filename, subdir), page)
+    kind = 'iframe' if filename.endswith('.html') else 'image'
+    return {'id': f'{kind}-{item_id}', 'type': kind, 'src': src}
+
+
+def build_dashboard(tabs, title='TFT Ranked Data Analysis', directory=DASHBOARD_DIR, subdir=''):
+    plotly_js = write_plotly_asset(directory)
+    page = os.path.join(directory, subdir)
+    os.makedirs(page, exist_ok=True)
+    buttons = []
+    sections = []
+    manifest = {}
+    for tab, (label, outputs) in tabs.items():
+        items = [dashboard_item(filename, subdir, directory) for filename, _ in outputs]
+        manifest[tab] = items
+        buttons.append(f'<button data-tab="{tab}" onclick="show(\'{tab}\')">{html.escape(label)}</button>')
+        blocks = []
+        for item, (_, description) in zip(items, outputs):
+            if item['type'] == 'chart':
+                element = f'<div id="{item["id"]}"></div>'
+            elif item['type'] == 'iframe':
+                element = f'<iframe id="{item["id"]}" loading="lazy"></iframe>'
+            else:
+                element = f'<img id="{item["id"]}" alt="{html.escape(description)}">'
+            blocks.append(f'<div class="item"><h3>{html.escape(description)}</h3>{element}</div>')
+        sections.append(f'<section data-tab="{tab}">{"".join(blocks)}</section>')
+
+    path = os.path.join(page, 'index.html')
+    src = os.path.relpath(os.path.join(directory, plotly_js), page)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(SHELL.format(title=html.escape(title), plotly_js=src, buttons=''.join(buttons),
+                             sections='\n'.join(sections), tabs=json.dumps(manifest)))
+    return path, os.path.join(directory, plotly_js)
@@ -0,0 +1,223 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+LAYOUT_CACHE_NAME = '.layout_cache.json'
+LAYOUT_CACHE = os.path.join('visualizations', LAYOUT_CACHE_NAME)
+EXACT_MAX_NODES = 1000
+GRID_CELLS = 32
+CHUNK_ELEMENTS = 4_000_000
+WARM_ITERATIONS = 15
+WARM_TEMPERATURE = 0.05
+WARM_MIN_KNOWN = 0.5
+REWEIGHT_TOLERANCE = 0.25
+MAX_LAYOUTS = 20
+
+
+def node_digest(nodes):
+    return hashlib.sha256(json.dumps(sorted(nodes), ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+
+def edge_key(a, b):
+    return f'{a}|{b}' if a <= b else f'{b}|{a}'
+
+
+def exact_repulsion(pos, rows, k):
+    force = np.zeros((len(rows), 2))
+    step = max(1, CHUNK_ELEMENTS // max(len(pos), 1))
+    for start in range(0, len(rows), step):
+        delta = pos[rows[start:start + step], None, :] - pos[None, :, :]
+        squared = np.maximum((delta ** 2).sum(axis=2), 1e-4)
+        force[start:start + step] = np.einsum('ijk,ij->ik', delta, k * k / squared)
+    return force
+
+
+def grid_repulsion(pos, rows, k):
+    side = int(np.clip(round(len(pos) ** 0.25), 4, GRID_CELLS))
+    low = pos.min(axis=0)
+    size = np.maximum((pos.max(axis=0) - low) / side, 1e-9)
+    cells = np.minimum(((pos - low) / size).astype(np.int64), side - 1)
+    cell = cells[:, 0] * side + cells[:, 1]
+    n_cells = side * side
+    mass = np.bincount(cell, minlength=n_cells).astype(np.float64)
+    occupied = np.flatnonzero(mass)
+    centroid = np.stack([np.bincount(cell, weights=pos[:, axis], minlength=n_cells) for axis in (0, 1)], axis=1)
+    centroid = centroid[occupied] / mass[occupied, None]
+
+    delta = pos[rows, None, :] - centroid[None, :, :]
+    squared = np.maximum((delta ** 2).sum(axis=2), 1e-4)
+    far = mass[occupied][None, :] * k * k / squared
+    far[cell[rows][:, None] == occupied[None, :]] = 0
+    force = np.einsum('ijk,ij->ik', delta, far)
+
+    order = np.argsort(cell, kind='stable')
+    starts = np.searchsorted(cell[order], cell[rows])
+    sizes = mass[cell[rows]].astype(np.int64)
+    local = np.repeat(np.arange(len(rows)), sizes)
+    offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    members = order[np.repeat(starts, sizes) + offsets]
+    delta = pos[rows[local]] - pos[members]
+    squared = np.maximum((delta ** 2).sum(axis=1), 1e-4)
+    near = delta * (k * k / squared)[:, None]
+    force[:, 0] += np.bincount(local, weights=near[:, 0], minlength=len(rows))
+    force[:, 1] += np.bincount(local, weights=near[:, 1], minlength=len(rows))
+    return force
+
+
+def fruchterman_reingold(pos, edges, weights, movable, k, iterations, temperature):
+    pos = pos.copy()
+    rows = np.flatnonzero(movable)
+    if len(rows) == 0 or iterations == 0:
+        return pos
+    touching = movable[edges[:, 0]] | movable[edges[:, 1]] if len(edges) else np.zeros(0, dtype=bool)
+    ei, ej, w = edges[touching, 0], edges[touching, 1], weights[touching]
+    repulsion = exact_repulsion if len(pos) <= EXACT_MAX_NODES else grid_repulsion
+    dt = temperature / (iterations + 1)
+    t = temperature
+    for _ in range(iterations):
+        displacement = repulsion(pos, rows, k)
+        delta = pos[ei] - pos[ej]
+        distance = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 0.01)
+        pull = delta * (w * distance / k)[:, None]
+        for axis in (0, 1):
+            attraction = (np.bincount(ej, weights=pull[:, axis], minlength=len(pos))
+                          - np.bincount(ei, weights=pull[:, axis], minlength=len(pos)))
+            displacement[:, axis] += attraction[rows]
+        length = np.maximum(np.sqrt((displacement ** 2).sum(axis=1)), 0.01)
+        pos[rows] += displacement * (t / length)[:, None]
+        t -= dt
+    return pos
+
+
+def rescale(pos):
+    pos = pos - pos.mean(axis=0)
+    scale = np.abs(pos).max()
+    return pos / scale if scale > 0 else pos
+
+
+class LayoutCache:
+    def __init__(self, path=LAYOUT_CACHE):
+        self.path = path
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.positions = data.get('positions', {})
+        self.edges = data.get('edges', {})
+        self.layouts = data.get('layouts', {})
+        self.last = None
+
+    def changed_nodes(self, nodes, weights, previous_positions, previous_edges):
+        changed = {node for node in nodes if node not in previous_positions}
+        present = set(nodes)
+        for key in set(weights) | set(previous_edges):
+            new, old = weights.get(key), previous_edges.get(key)
+            if new is not None and old is not None and abs(new - old) <= REWEIGHT_TOLERANCE * max(old, 1e-9):
+                continue
+            changed.update(node for node in key.split('|') if node in present)
+        return changed
+
+    def layout(self, nodes, edges, k=2, iterations=50, seed=0):
+        start = time.perf_counter()
+        nodes = list(nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        weights = {edge_key(a, b): float(w) for a, b, w in edges}
+        key = node_digest(nodes)
+        entry = self.layouts.pop(key, None)
+
+        if entry is not None and entry['edges'] == weights:
+            mode, moved = 'cache', 0
+            positions = entry['positions']
+        else:
+            previous = entry or {'positions': self.positions, 'edges': self.edges}
+            known = [node for node in nodes if node in previous['positions']]
+            rng = np.random.default_rng(seed)
+            pairs = [tuple(key.split('|')) for key in weights]
+            edge_array = np.array([[index[a], index[b]] for a, b in pairs], dtype=np.int64).reshape(-1, 2)
+            weight_array = np.array(list(weights.values()), dtype=np.float64)
+
+            if len(known) < WARM_MIN_KNOWN * len(nodes):
+                mode, moved = 'cold', len(nodes)
+                pos = fruchterman_reingold(rng.random((len(nodes), 2)), edge_array, weight_array,
+                                           np.ones(len(nodes), dtype=bool), k, iterations, 0.1)
+                pos = rescale(pos)
+            else:
+                changed = self.changed_nodes(nodes, weights, previous['positions'], previous['edges'])
+                pos = np.zeros((len(nodes), 2))
+                for node in known:
+                    pos[index[node]] = previous['positions'][node]
+                known_set = set(known)
+                for node in nodes:
+                    if node in known_set:
+                        continue
+                    anchors = [previous['positions'][other] for other in
+                               (b if a == node else a for a, b in pairs if node in (a, b)) if other in known_set]
+                    center = np.mean(anchors, axis=0) if anchors else pos[[index[n] for n in known]].mean(axis=0)
+                    pos[index[node]] = center + rng.normal(0, 0.05, 2)
+                movable = np.zeros(len(nodes), dtype=bool)
+                movable[[index[node] for node in changed]] = True
+                mode, moved = 'warm', int(movable.sum())
+                pos = fruchterman_reingold(pos, edge_array, weight_array, movable, k,
+                                           WARM_ITERATIONS, WARM_TEMPERATURE)
+            positions = {node: pos[index[node]].tolist() for node in nodes}
+
+        self.layouts[key] = {'edges': weights, 'positions': positions}
+        while len(self.layouts) > MAX_LAYOUTS:
+            self.layouts.pop(next(iter(self.layouts)))
+        self.positions.update(positions)
+        self.edges = weights
+        self.last = {'mode': mode, 'moved': moved, 'nodes': len(nodes), 'edges': len(weights),
+                     'seconds': time.perf_counter() - start}
+        return {node: tuple(positions[node]) for node in nodes}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'positions': self.positions, 'edges': self.edges, 'layouts': self.layouts}, f)
+        os.replace(tmp_path, self.path)
+
+
+def random_graph(rng, n, degree):
+    m = n * degree // 2
+    a = rng.integers(0, n, m)
+    b = rng.integers(0, n, m)
+    keep = a != b
+    return [(f'n{x}', f'n{y}', float(w)) for x, y, w in zip(a[keep], b[keep], rng.integers(1, 20, keep.sum()))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark layout mạng: cold, cache và warm-start sau một thay đổi nhỏ")
+    parser.add_argument('--nodes', default='15,200,2000')
+    parser.add_argument('--degree', type=int, default=6)
+    parser.add_argument('--change', type=int, default=3, help="Số node mới thêm vào ở lần chạy warm-start")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'Nodes':>7} {'Edges':>8} {'Cold (s)':>9} {'Cache (s)':>10} {'Warm (s)':>9} {'Moved':>6}")
+    for n in (int(value) for value in args.nodes.split(',')):
+        cache = LayoutCache(path=os.devnull)
+        edges = random_graph(rng, n, args.degree)
+        nodes = [f'n{i}' for i in range(n)]
+        timings = []
+        for _ in range(2):
+            cache.layout(nodes, edges, seed=args.seed)
+            timings.append(cache.last['seconds'])
+        extra = [f'x{i}' for i in range(args.change)]
+        extra_edges = [(node, nodes[int(rng.integers(n))], 5.0) for node in extra]
+        cache.layout(nodes + extra, edges + extra_edges, seed=args.seed)
+        print(f"{n:>7} {len(edges):>8} {timings[0]:>9.3f} {timings[1]:>10.4f} "
+              f"{cache.last['seconds']:>9.4f} {cache.last['moved']:>6}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,48 +1,252 @@
+import argparse
 import csv
 import json
+import os
+import re
+
+from snapshot_archive import open_snapshot
+
+CARRIES_CSV = "data/top_carries.csv"
+CHAMPIONS_CSV = "data/champions.csv"
+CARRY_SCOPES = ("RecentResult", "currentPatchResult")
+CARRY_FIELDNAMES = ["puuid", "scope", "champion_id", "count", "avg"]
+CHAMPION_PREFIX = re.compile(r"^TFT\d+_")
+
+PRIORITY = ["rank",
+            "rating_numeric",
+            "num_played",
+            "player_id",
+            "summoner_region",
+            "riot_id",
+            "puuid",
+            "rating"]
+
+DECLARED_FIELDNAMES = PRIORITY + sorted([
+    "live.encryption_key",
+    "live.game_start_time",
+    "live.match_id",
+    "live.player_id",
+    "live.type",
+] + [
+    f"stats.{scope}.{field}"
+    for scope in ("RecentResult", "currentPatchResult")
+    for field in ("ItemData.AD", "ItemData.AP", "ItemData.Tank", "avg_similarity",
+                  "board_strength_percentile_sum", "damage_percentile_sum", "lpChange",
+                  "num_played", "percentile_count", "place_sum", "topCarries", "wins")
+] + [
+    "stats.appMatches",
+    "stats.num_played",
+    "stats.place_sum",
+    "stats.wins",
+])
 
 
 def flatten(obj, parent_key="", sep="."):
     items = {}
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
-            items.update(flatten(v, new_key, sep))
-    elif isinstance(obj, (list, tuple)):
-        items[parent_key] = json.dumps(obj, ensure_ascii=False)
-    else:
-        items[parent_key] = obj
+    stack = [(parent_key, obj)]
+    while stack:
+        key, value = stack.pop()
+        if isinstance(value, dict):
+            prefix = f"{key}{sep}" if key else ""
+            stack.extend((prefix + k, v) for k, v in value.items())
+        elif isinstance(value, (list, tuple)):
+            items[key] = json.dumps(value, ensure_ascii=False)
+        else:
+            items[key] = value
     return items
 
 
-def convert_json_to_csv(input_file, output_file):
-    with open(input_file, encoding="utf-8") as f:
-        data = json.load(f)
-    
-    records = data["data"] if isinstance(data, dict) and "data" in data else data
-    
-    flattened = [flatten(rec) for rec in records]
-    
-    priority = ["rank",
-                "rating_numeric",
-                "num_played",
-                "player_id", 
-                "summoner_region",
-                "riot_id",
-                "puuid",
-                "rating"]
+class ChampionIndex:
+    def __init__(self, path=None):
+        self.path = path
+        self.ids = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    self.ids[row["name"]] = int(row["champion_id"])
+
+    def intern(self, character_id):
+        name = CHAMPION_PREFIX.sub("", character_id)
+        champion_id = self.ids.get(name)
+        if champion_id is None:
+            champion_id = self.ids[name] = len(self.ids)
+        return champion_id
+
+    def save(self, path=None):
+        with open(path or self.path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["champion_id", "name"])
+            writer.writerows((champion_id, name) for name, champion_id in
+                             sorted(self.ids.items(), key=lambda item: item[1]))
+
+
+def explode_carries(rec, champions):
+    stats = rec.get("stats") or {}
+    for scope in CARRY_SCOPES:
+        for carry in (stats.get(scope) or {}).get("topCarries") or []:
+            yield (rec.get("puuid"), scope, champions.intern(carry["character_id"]),
+                   carry["count"], carry["avg"])
+
+
+NUMBER_TAIL = frozenset("0123456789.eE+-")
+
+
+class _StreamReader:
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.pos > self.chunk_size:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        self.buf += chunk
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ""
+            self._fill()
+
+    def expect(self, chars):
+        ch = self.peek()
+        if ch not in chars:
+            raise ValueError(f"Invalid JSON: expected one of {chars!r} at offset {self.pos}, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            if not self.eof and NUMBER_TAIL.issuperset(self.buf[end:]):
+                self._fill()
+                continue
+            self.pos = end
+            return obj
+
+    def array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+
+def iter_records(input_file):
+    with open_snapshot(input_file) as f:
+        reader = _StreamReader(f)
+        first = reader.peek()
+        if first == "[":
+            yield from reader.array()
+            return
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if key == "data" and reader.peek() == "[":
+                yield from reader.array()
+            else:
+                reader.value()
+            if reader.expect(",}") == "}":
+                return
+
+
+def scan_fieldnames(input_file):
     all_keys = set()
-    for row in flattened:
-        all_keys.update(row.keys())
-    
-    fieldnames = [f for f in priority if f in all_keys]
-    fieldnames += sorted(k for k in all_keys if k not in priority)
-    
-    with open(output_file, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+    for rec in iter_records(input_file):
+        all_keys.update(flatten(rec).keys())
+    return order_fieldnames(all_keys)
+
+
+def order_fieldnames(all_keys):
+    fieldnames = [f for f in PRIORITY if f in all_keys]
+    fieldnames += sorted(k for k in all_keys if k not in PRIORITY)
+    return fieldnames
+
+
+def is_up_to_date(input_file, output_file):
+    return (os.path.exists(output_file)
+            and os.path.getmtime(output_file) >= os.path.getmtime(input_file))
+
+
+def convert_json_to_csv(input_file, output_file, fieldnames=None,
+                        carries_file=None, champions_file=CHAMPIONS_CSV):
+    if fieldnames is None:
+        fieldnames = scan_fieldnames(input_file)
+    known = set(fieldnames)
+    dropped = set()
+    count = 0
+    champions = ChampionIndex(champions_file) if carries_file else None
+
+    with open(output_file, "w", encoding="utf-8", newline="") as f, \
+            open(carries_file or os.devnull, "w", encoding="utf-8", newline="") as cf:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
         writer.writeheader()
-        writer.writerows(flattened)
+        carries_writer = csv.writer(cf)
+        carries_writer.writerow(CARRY_FIELDNAMES)
+        for rec in iter_records(input_file):
+            row = flatten(rec)
+            if len(row) > len(known) or not known.issuperset(row):
+                dropped.update(k for k in row if k not in known)
+            writer.writerow(row)
+            if champions is not None:
+                carries_writer.writerows(explode_carries(rec, champions))
+            count += 1
+
+    if champions is not None and champions.path:
+        champions.save()
+
+    if dropped:
+        print(f"Cảnh báo: bỏ qua {len(dropped)} cột ngoài schema: {', '.join(sorted(dropped))}")
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chuyển leaderboard JSON sang CSV")
+    parser.add_argument("--input", default="data/leaderboard.json")
+    parser.add_argument("--output", default="data/leaderboard.csv")
+    parser.add_argument("--carries", default=CARRIES_CSV,
+                        help="Bảng topCarries dạng dài (puuid, scope, champion_id, count, avg); '' để bỏ qua")
+    parser.add_argument("--champions", default=CHAMPIONS_CSV, help="Bảng ánh xạ champion_id -> tên tướng")
+    parser.add_argument("--schema", choices=["scan", "declared"], default="scan",
+                        help="scan: quét nhanh một lượt để lấy danh sách cột; "
+                             "declared: dùng schema MetaTFT khai báo sẵn (một lượt duy nhất)")
+    parser.add_argument("--force", action="store_true", help="Chuyển đổi lại kể cả khi CSV đã mới hơn JSON")
+    args = parser.parse_args(argv)
+
+    outputs = [args.output] + ([args.carries] if args.carries else [])
+    if not args.force and all(is_up_to_date(args.input, output) for output in outputs):
+        print(f"{', '.join(outputs)} đã cập nhật - bỏ qua")
+        return
+    fieldnames = DECLARED_FIELDNAMES if args.schema == "declared" else None
+    count = convert_json_to_csv(args.input, args.output, fieldnames, args.carries or None, args.champions)
+    print(f"Saved CSV to {args.output} ({count} rows)")
+    if args.carries:
+        print(f"Saved top carries to {args.carries} (champions: {args.champions})")
 
 
-convert_json_to_csv("data/leaderboard.json", "data/leaderboard.csv")
-print("Saved CSV to data/leaderboard.csv")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+import argparse
+import asyncio
+import bisect
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+import snapshot_store
+
+HOST = '127.0.0.1'
+PORT = 8765
+CACHE_SIZE = 4096
+RELOAD_SECONDS = 30
+SEARCH_LIMIT = 10
+MAX_LIMIT = 200
+FIELDS = ['puuid'] + list(snapshot_store.PLAYER_COLUMNS)
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 503: 'Service Unavailable'}
+
+
+class QueryError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LRUCache:
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        if len(self.items) > self.size:
+            self.items.popitem(last=False)
+
+
+class StoreSource:
+    def __init__(self, db_path=snapshot_store.DB_PATH):
+        self.db_path = db_path
+
+    def version(self):
+        if not os.path.exists(self.db_path):
+            return None
+        conn = snapshot_store.connect(self.db_path)
+        try:
+            latest = snapshot_store.list_snapshots(conn, 1)
+        finally:
+            conn.close()
+        return f"snapshot #{latest[0][0]} ({latest[0][1]})" if latest else None
+
+    def load(self):
+        conn = snapshot_store.connect(self.db_path)
+        try:
+            latest = snapshot_store.list_snapshots(conn, 1)
+            if not latest:
+                raise ValueError("Kho snapshot đang trống")
+            rows = conn.execute(f"SELECT puuid, {', '.join(snapshot_store.PLAYER_COLUMNS)} FROM players "
+                                f"WHERE snapshot_id = ?", (latest[0][0],)).fetchall()
+        finally:
+            conn.close()
+        return f"snapshot #{latest[0][0]} ({latest[0][1]})", rows
+
+
+class FileSource:
+    def __init__(self, path):
+        self.path = path
+
+    def version(self):
+        if not os.path.exists(self.path):
+            return None
+        stat = os.stat(self.path)
+        return f"{self.path} (mtime_ns {stat.st_mtime_ns}, {stat.st_size} bytes)"
+
+    def load(self):
+        from json_to_csv import iter_records
+
+        version = self.version()
+        return version, [snapshot_store.player_row(rec) for rec in iter_records(self.path)]
+
+
+class PlayerIndex:
+    def __init__(self, rows, version, cache_size=CACHE_SIZE):
+        start = time.perf_counter()
+        self.version = version
+        players = {}
+        for row in rows:
+            players[row[0]] = dict(zip(FIELDS, row))
+        self.players = sorted(players.values(), key=lambda p: (p['rank'] is None, p['rank'] or 0))
+        self.by_puuid = {p['puuid']: i for i, p in enumerate(self.players)}
+        self.by_rank = {p['rank']: i for i, p in enumerate(self.players) if p['rank'] is not None}
+
+        names = sorted((p['riot_id'].casefold(), i) for i, p in enumerate(self.players) if p['riot_id'])
+        self.name_keys = [name for name, _ in names]
+        self.name_rows = [i for _, i in names]
+
+        self.regions = {}
+        for i, p in enumerate(self.players):
+            p['region_rank'] = None
+            if p['summoner_region']:
+                self.regions.setdefault(p['summoner_region'], []).append(i)
+        for region_rows in self.regions.values():
+            for position, i in enumerate(region_rows, 1):
+                self.players[i]['region_rank'] = position
+
+        rated = [i for i, p in enumerate(self.players) if p['rating_numeric'] is not None]
+        values = np.array([self.players[i]['rating_numeric'] for i in rated], dtype=np.float64)
+        self.ratings = np.sort(values)
+        percentiles = np.searchsorted(self.ratings, values, side='right') / max(len(values), 1) * 100
+        for p in self.players:
+            p['percentile'] = None
+        for i, percentile in zip(rated, percentiles.round(2).tolist()):
+            self.players[i]['percentile'] = percentile
+
+        self.cache = LRUCache(cache_size)
+        self.loaded_at = time.time()
+        self.build_seconds = time.perf_counter() - start
+
+    def player(self, puuid):
+        if puuid not in self.by_puuid:
+            raise QueryError(404, f"Không có người chơi: {puuid}")
+        return self.players[self.by_puuid[puuid]]
+
+    def search(self, prefix, limit=SEARCH_LIMIT):
+        key = prefix.casefold()
+        matches = []
+        for pos in range(bisect.bisect_left(self.name_keys, key), len(self.name_keys)):
+            if len(matches) == limit or not self.name_keys[pos].startswith(key):
+                break
+            matches.append(self.players[self.name_rows[pos]])
+        return matches
+
+    def rank(self, rank):
+        if rank not in self.by_rank:
+            raise QueryError(404, f"Không có hạng: {rank}")
+        return self.players[self.by_rank[rank]]
+
+    def region(self, region, start=1, limit=SEARCH_LIMIT):
+        if region not in self.regions:
+            raise QueryError(404, f"Không có khu vực: {region} (có: {', '.join(sorted(self.regions))})")
+        rows = self.regions[region][start - 1:start - 1 + limit]
+        return {'region': region, 'players': len(self.regions[region]), 'start': start,
+                'results': [self.players[i] for i in rows]}
+
+    def percentile(self, rating):
+        if len(self.ratings) == 0:
+            raise QueryError(404, "Snapshot không có rating")
+        below = int(np.searchsorted(self.ratings, rating, side='right'))
+        return {'rating': rating, 'percentile': round(below / len(self.ratings) * 100, 2),
+                'players_at_or_below': below, 'rated_players': len(self.ratings)}
+
+    def route(self, target):
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if parts[0] == 'player' and len(parts) == 2:
+            return self.player(parts[1])
+        if parts[0] == 'search' and 'riot_id' in query:
+            return {'query': query['riot_id'], 'results': self.search(query['riot_id'], limit_param(query))}
+        if parts[0] == 'rank' and len(parts) == 2:
+            return self.rank(int_param({'rank': parts[1]}, 'rank'))
+        if parts[0] == 'region' and len(parts) == 2:
+            return self.region(parts[1], max(int_param(query, 'start', 1), 1), limit_param(query))
+        if parts[0] == 'percentile' and 'rating' in query:
+            return self.percentile(float_param(query, 'rating'))
+        raise QueryError(404, "Không có endpoint: dùng /player/<puuid>, /search?riot_id=, /rank/<n>, "
+                              "/region/<region>?start=&limit=, /percentile?rating=, /status")
+
+    def handle(self, target):
+        body = self.cache.get(target)
+        if body is not None:
+            return 200, body
+        try:
+            payload = self.route(target)
+        except QueryError as e:
+            return e.status, json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.cache.put(target, body)
+        return 200, body
+
+
+def int_param(query, name, default=None):
+    try:
+        return int(query[name]) if name in query else default
+    except ValueError:
+        raise QueryError(400, f"{name} phải là số nguyên") from None
+
+
+def float_param(query, name):
+    try:
+        value = float(query[name])
+    except ValueError:
+        raise QueryError(400, f"{name} phải là số") from None
+    if not math.isfinite(value):
+        raise QueryError(400, f"{name} phải là số hữu hạn")
+    return value
+
+
+def limit_param(query):
+    limit = int_param(query, 'limit', SEARCH_LIMIT)
+    if limit < 1:
+        raise QueryError(400, "limit phải >= 1")
+    return min(limit, MAX_LIMIT)
+
+
+class PlayerService:
+    def __init__(self, source, reload_seconds=RELOAD_SECONDS, cache_size=CACHE_SIZE):
+        self.source = source
+        self.reload_seconds = reload_seconds
+        self.cache_size = cache_size
+        self.index = None
+        self.swaps = 0
+        self.watcher = None
+
+    def build(self):
+        version, rows = self.source.load()
+        return PlayerIndex(rows, version, self.cache_size)
+
+    async def refresh(self):
+        version = await asyncio.to_thread(self.source.version)
+        if version is None or (self.index is not None and version == self.index.version):
+            return False
+        index = await asyncio.to_thread(self.build)
+        self.index = index
+        self.swaps += 1
+        print(f"Đã nạp {index.version}: {len(index.players)} người chơi, "
+              f"index {index.build_seconds * 1000:.0f} ms", flush=True)
+        return True
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.reload_seconds)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Lỗi khi nạp snapshot mới, vẫn phục vụ bản cũ: {e}", flush=True)
+
+    def status(self):
+        index = self.index
+        if index is None:
+            return {'ready': False}
+        return {'ready': True, 'version': index.version, 'players': len(index.players),
+                'regions': len(index.regions), 'loaded_at': index.loaded_at, 'swaps': self.swaps,
+                'build_ms': round(index.build_seconds * 1000, 1), 'cache_entries': len(index.cache.items),
+                'cache_hits': index.cache.hits, 'cache_misses': index.cache.misses}
+
+    def respond(self, target):
+        if urlsplit(target).path.rstrip('/') == '/status':
+            return 200, json.dumps(self.status(), ensure_ascii=False).encode('utf-8')
+        index = self.index
+        if index is None:
+            return 503, json.dumps({'error': "Chưa nạp snapshot"}).encode('utf-8')
+        return index.handle(target)
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get('content-length', '0') != '0':
+                    await reader.readexactly(int(headers['content-length']))
+
+                request = line.decode('latin-1').split()
+                if len(request) != 3:
+                    status, body = 400, b'{"error": "Bad request line"}'
+                elif request[0] != 'GET':
+                    status, body = 405, b'{"error": "Only GET is supported"}'
+                else:
+                    status, body = self.respond(request[1])
+                keep_alive = (len(request) == 3 and request[2] == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(body)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=HOST, port=PORT):
+        await self.refresh()
+        server = await asyncio.start_server(self.handle_client, host, port)
+        self.watcher = asyncio.create_task(self.watch())
+        return server
+
+
+def sample_targets(index, n, seed=0):
+    rng = random.Random(seed)
+    players = index.players
+    regions = list(index.regions)
+    targets = {'player': [], 'search': [], 'rank': [], 'region': [], 'percentile': []}
+    for _ in range(n):
+        p = players[rng.randrange(len(players))]
+        targets['player'].append(f"/player/{p['puuid']}")
+        targets['search'].append(f"/search?riot_id={(p['riot_id'] or 'a')[:3]}")
+        targets['rank'].append(f"/rank/{p['rank']}")
+        targets['region'].append(f"/region/{rng.choice(regions)}?start={rng.randint(1, 20)}")
+        targets['percentile'].append(f"/percentile?rating={rng.randint(0, 5000)}")
+    return targets
+
+
+def percentiles_us(timings):
+    timings = np.array(timings) * 1e6
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+async def http_roundtrips(service, targets):
+    server = await asyncio.start_server(service.handle_client, HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection(HOST, port)
+    timings = []
+    try:
+        for target in targets:
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {HOST}\r\n\r\n".encode('latin-1'))
+            await writer.drain()
+            length = 0
+            while True:
+                header = await reader.readline()
+                if header == b'\r\n':
+                    break
+                if header.lower().startswith(b'content-length:'):
+                    length = int(header.split(b':')[1])
+            await reader.readexactly(length)
+            timings.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+        await asyncio.sleep(0)
+        server.close()
+        await server.wait_closed()
+    return timings
+
+
+def benchmark(service, n):
+    index = service.build()
+    service.index = index
+    print(f"Đã nạp {index.version}: {len(index.players)} người chơi, index {index.build_seconds * 1000:.0f} ms\n")
+    print(f"{'Truy vấn':<12} {'Không cache p50 (µs)':>21} {'p99':>8} {'Cache p50 (µs)':>15} {'p99':>8}")
+    targets = sample_targets(index, n)
+    for kind, kind_targets in targets.items():
+        index.cache = LRUCache(0)
+        cold = []
+        for target in kind_targets:
+            start = time.perf_counter()
+            index.handle(target)
+            cold.append(time.perf_counter() - start)
+        index.cache = LRUCache(len(kind_targets))
+        for target in kind_targets:
+            index.handle(target)
+        warm = []
+        for target in kind_targets:
+            start = time.perf_counter()
+            index.handle(target)
+            warm.append(time.perf_counter() - start)
+        print(f"{kind:<12} {percentiles_us(cold)[0]:>21.1f} {percentiles_us(cold)[1]:>8.1f} "
+              f"{percentiles_us(warm)[0]:>15.1f} {percentiles_us(warm)[1]:>8.1f}")
+    index.cache = LRUCache(service.cache_size)
+    p50, p99 = percentiles_us(asyncio.run(http_roundtrips(service, targets['player'])))
+    print(f"\nHTTP keep-alive round-trip /player: p50 {p50:.0f} µs, p99 {p99:.0f} µs")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Dịch vụ HTTP tra cứu người chơi từ snapshot mới nhất (index trong bộ nhớ)")
+    parser.add_argument('--db', default=snapshot_store.DB_PATH, help="Kho snapshot SQLite (mặc định)")
+    parser.add_argument('--input', default=None,
+                        help="Dùng file leaderboard JSON (có thể nén, vd. từ data/archive/) thay vì kho snapshot")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--reload', type=float, default=RELOAD_SECONDS,
+                        help="Chu kỳ (giây) kiểm tra snapshot mới để hot-swap index")
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE, help="Số response giữ trong LRU cache")
+    parser.add_argument('--bench', type=int, default=None, metavar='N',
+                        help="Đo độ trễ N truy vấn mỗi loại thay vì chạy server")
+    return parser.parse_args(argv)
+
+
+async def serve(service, host, port):
+    server = await service.start(host, port)
+    print(f"Đang phục vụ tại http://{host}:{port} (kiểm tra snapshot mới mỗi {service.reload_seconds:g} s)",
+          flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    source = FileSource(args.input) if args.input else StoreSource(args.db)
+    if source.version() is None:
+        print(f"Không có snapshot trong {args.input or args.db}")
+        return 2
+    service = PlayerService(source, args.reload, args.cache_size)
+    if args.bench:
+        benchmark(service, args.bench)
+        return 0
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,288 @@
+import argparse
+import contextlib
+import cProfile
+import functools
+import importlib.abc
+import json
+import os
+import runpy
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+REPORT = 'data/profile/report.json'
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HOOKS = [
+    ('pandas', 'read_csv', 'read'),
+    ('pandas', 'read_parquet', 'read'),
+    ('pandas', 'DataFrame.to_csv', 'write'),
+    ('pandas', 'DataFrame.to_parquet', 'write'),
+    ('json', 'load', 'read'),
+    ('json', 'dump', 'write'),
+    ('dataset', 'DatasetContext._load', 'read'),
+    ('dataset', 'load_top_carries', 'read'),
+    ('aggregate_cube', 'read_cube', 'read'),
+    ('aggregate_cube', 'build', 'compute'),
+    ('aggregate_cube', 'rollup', 'compute'),
+    ('classification', 'classify', 'compute'),
+    ('distributions', 'summarize', 'compute'),
+    ('streaming_stats', 'describe', 'compute'),
+    ('carry_cooccurrence', 'cooccurrence', 'compute'),
+    ('graph_layout', 'LayoutCache.layout', 'compute'),
+    ('wordcloud', 'WordCloud.generate_from_frequencies', 'compute'),
+    ('matplotlib.figure', 'Figure.savefig', 'write'),
+    ('plotly.basedatatypes', 'BaseFigure.write_html', 'write'),
+    ('plotly.basedatatypes', 'BaseFigure.to_json', 'write'),
+    ('folium', 'Map.save', 'write'),
+]
+
+_active = None
+_installed = []
+_finder = None
+
+
+class Profiler:
+    def __init__(self, memory=False, cprofile_dir=None):
+        self.memory = memory
+        self.cprofile_dir = cprofile_dir
+        self.spans = []
+        self._stack = []
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def span(self, name, kind='stage'):
+        frame = {'name': f'{kind}:{name}', 'current': 0, 'peak': 0}
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame.update(current=current, peak=current)
+        self._stack.append(frame)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self._stack.pop()
+            peak_mb = None
+            if self.memory:
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+                peak_mb = (peak - frame['current']) / (1024 * 1024)
+            self.spans.append({
+                'name': name,
+                'kind': kind,
+                'parent': self._stack[-1]['name'] if self._stack else None,
+                'depth': len(self._stack),
+                'wall': wall,
+                'cpu': cpu,
+                'peak_mb': peak_mb,
+            })
+
+    @contextlib.contextmanager
+    def cprofile(self, name):
+        if not self.cprofile_dir:
+            yield
+            return
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            os.makedirs(self.cprofile_dir, exist_ok=True)
+            profile.dump_stats(os.path.join(self.cprofile_dir, f'{name}.prof'))
+
+    @contextlib.contextmanager
+    def section(self, name, kind='analysis'):
+        with self.span(name, kind), self.cprofile(name):
+            yield
+
+    def take(self):
+        spans, self.spans = self.spans, []
+        return spans
+
+
+def wrap(fn, name, kind):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _active is None:
+            return fn(*args, **kwargs)
+        with _active.span(name, kind):
+            return fn(*args, **kwargs)
+    wrapper.__wrapped_profiling__ = fn
+    return wrapper
+
+
+def patch(module):
+    for module_name, path, kind in HOOKS:
+        if module_name != module.__name__:
+            continue
+        owner = module
+        *parents, attr = path.split('.')
+        for parent in parents:
+            owner = getattr(owner, parent)
+        original = getattr(owner, attr, None)
+        if original is None or hasattr(original, '__wrapped_profiling__'):
+            continue
+        wrapper = wrap(original, f'{module_name}.{path}', kind)
+        setattr(owner, attr, wrapper)
+        _installed.append((owner, attr, original))
+        if not parents:
+            rebind(original, wrapper, attr)
+
+
+def rebind(original, wrapper, attr):
+    for module in list(sys.modules.values()):
+        path = getattr(module, '__file__', None) or ''
+        if os.path.dirname(os.path.abspath(path)) == PROJECT_DIR and getattr(module, attr, None) is original:
+            setattr(module, attr, wrapper)
+            _installed.append((module, attr, original))
+
+
+class HookFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, names):
+        self.names = names
+
+    def find_spec(self, name, path, target=None):
+        if name not in self.names:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            exec_module = spec.loader.exec_module
+
+            def exec_and_patch(module):
+                exec_module(module)
+                patch(module)
+            spec.loader.exec_module = exec_and_patch
+        return spec
+
+
+def install():
+    global _finder
+    if _finder is not None:
+        return
+    pending = set()
+    for module_name, _, _ in HOOKS:
+        if module_name in sys.modules:
+            patch(sys.modules[module_name])
+        else:
+            pending.add(module_name)
+    _finder = HookFinder(pending)
+    sys.meta_path.insert(0, _finder)
+
+
+def uninstall():
+    global _finder
+    if _finder is not None:
+        sys.meta_path.remove(_finder)
+        _finder = None
+    while _installed:
+        owner, attr, original = _installed.pop()
+        setattr(owner, attr, original)
+
+
+def activate(memory=False, cprofile_dir=None):
+    global _active
+    if _active is None:
+        install()
+        _active = Profiler(memory, cprofile_dir)
+    return _active
+
+
+def deactivate():
+    global _active
+    _active = None
+    uninstall()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def get_profiler():
+    return _active
+
+
+def summarize(spans):
+    summary = {}
+    for span in spans:
+        entry = summary.setdefault((span['kind'], span['name']), {
+            'kind': span['kind'],
+            'name': span['name'],
+            'calls': 0,
+            'wall': 0.0,
+            'cpu': 0.0,
+            'peak_mb': None,
+        })
+        entry['calls'] += 1
+        entry['wall'] += span['wall']
+        entry['cpu'] += span['cpu']
+        if span['peak_mb'] is not None:
+            entry['peak_mb'] = max(entry['peak_mb'] or 0.0, span['peak_mb'])
+    return sorted(summary.values(), key=lambda entry: entry['wall'], reverse=True)
+
+
+def write_report(path, spans, extra=None):
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'argv': sys.argv,
+        'summary': summarize(spans),
+        'spans': spans,
+    }
+    report.update(extra or {})
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return report
+
+
+def print_summary(spans, top=10):
+    print(f"\n{'Điểm đo (hot path)':<56} {'Lần':>5} {'Wall (s)':>9} {'CPU (s)':>9} {'Peak MiB':>9}")
+    print("-" * 92)
+    for entry in summarize(spans)[:top]:
+        peak = f"{entry['peak_mb']:.1f}" if entry['peak_mb'] is not None else '-'
+        print(f"{entry['kind'] + ':' + entry['name']:<56} {entry['calls']:>5} {entry['wall']:>9.2f} "
+              f"{entry['cpu']:>9.2f} {peak:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chạy một script của pipeline với instrumentation (không cần sửa script)")
+    parser.add_argument('--memory', action='store_true', help="Đo peak bộ nhớ bằng tracemalloc")
+    parser.add_argument('--cprofile', default=None, help="Thư mục ghi file cProfile (.prof)")
+    parser.add_argument('--output', default=REPORT)
+    parser.add_argument('script')
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    profiler = activate(args.memory, args.cprofile)
+    name = os.path.splitext(os.path.basename(args.script))[0]
+    sys.argv = [args.script] + args.args
+    exit_code = 0
+    try:
+        with profiler.section(name, 'script'):
+            runpy.run_path(args.script, run_name='__main__')
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    spans = profiler.take()
+    deactivate()
+    write_report(args.output, spans, {'exit_code': exit_code})
+    print_summary(spans)
+    print(f"\nĐã lưu báo cáo profiling vào {args.output}")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,20 +1,262 @@
+import argparse
+import contextlib
+import importlib
+import io
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-def run_analysis(script_name, description):
+import aggregate_cube
+import dataset
+import distributions
+import figures
+import profiling
+from build_cache import BuildCache, build_key
+
+ANALYSES = {
+    'item_data': {
+        'module': 'analysis_item_data',
+        'description': '1. Thống kê ItemData (AD, AP, Tank) - Treemap',
+        'outputs': [
+            ("item_data_treemap.html", "Treemap - Phân bố trang bị (Plotly Interactive)"),
+        ],
+        'cube': True,
+    },
+    'avg_similarity': {
+        'module': 'analysis_avg_similarity',
+        'description': '2. Thống kê Độ Flexible (avg_similarity) - Histogram + Boxplot',
+        'outputs': [
+            ("avg_similarity_distribution.html", "Histogram + Boxplot - Độ flexible (Plotly Interactive)"),
+        ],
+    },
+    'top_carries': {
+        'module': 'analysis_top_carries',
+        'description': '3. Thống kê Top Carries - WordCloud + Network Graph',
+        'outputs': [
+            ("top_carries_wordcloud.png", "WordCloud - Tướng carry phổ biến"),
+            ("top_carries_network.html", "Network Graph - Mối quan hệ tướng (Plotly Interactive)"),
+        ],
+        'inputs': [dataset.TOP_CARRIES_CSV, dataset.CHAMPIONS_CSV],
+    },
+    'playstyle': {
+        'module': 'analysis_playstyle',
+        'description': '4. Thống kê Playstyle (Eco vs High Tempo) - Scatter + Regression',
+        'outputs': [
+            ("playstyle_scatter.html", "Scatter + Regression - Phong cách chơi (Plotly Interactive)"),
+        ],
+    },
+    'region': {
+        'module': 'analysis_region',
+        'description': '5. Thống kê Người chơi theo Region - Map + Sunburst',
+        'outputs': [
+            ("region_map.html", "Map - Phân bố người chơi theo khu vực (Folium)"),
+            ("region_sunburst.html", "Sunburst - Phân bố theo châu lục (Plotly Interactive)"),
+        ],
+        'standalone': ["region_map.html"],
+        'cube': True,
+    },
+    'performance': {
+        'module': 'analysis_performance',
+        'description': '6. Thống kê Performance (Winrate & Placement) - Heatmap + Violin',
+        'outputs': [
+            ("performance_heatmap.html", "Heatmap - Tương quan metrics (Plotly Interactive)"),
+            ("performance_violin.html", "Violin Plot - Phân tích performance (Plotly Interactive)"),
+        ],
+    },
+}
+
+DEFAULT_OPTIONS = {'output': 'standalone', 'distributions': 'auto', 'scope': dataset.DEFAULT_SCOPE}
+
+def select_analyses(only=None):
+    if not only:
+        return list(ANALYSES)
+    names = [name.strip() for name in only.split(',') if name.strip()]
+    unknown = [name for name in names if name not in ANALYSES]
+    if unknown:
+        raise ValueError(f"Không có phân tích: {', '.join(unknown)} (có: {', '.join(ANALYSES)})")
+    return names
+
+def select_scopes(scopes=None):
+    if not scopes:
+        return [dataset.DEFAULT_SCOPE]
+    if scopes == 'all':
+        return list(dataset.SCOPES)
+    names = [scope.strip() for scope in scopes.split(',') if scope.strip()]
+    unknown = [scope for scope in names if scope not in dataset.SCOPES]
+    if unknown:
+        raise ValueError(f"Không có scope: {', '.join(unknown)} (có: {', '.join(dataset.SCOPES)})")
+    return names
+
+def scope_subdir(scope):
+    return '' if scope == dataset.DEFAULT_SCOPE else scope
+
+def job_name(name, scope=dataset.DEFAULT_SCOPE):
+    return name if scope == dataset.DEFAULT_SCOPE else f"{name}@{scope}"
+
+def output_path(name, filename, mode='standalone', scope=dataset.DEFAULT_SCOPE):
+    if filename.endswith('.html') and filename not in ANALYSES[name].get('standalone', []):
+        return figures.chart_path(filename, mode, scope_subdir(scope))
+    return figures.asset_path(filename, scope_subdir(scope))
+
+def output_paths(name, mode='standalone', scope=dataset.DEFAULT_SCOPE):
+    return [output_path(name, filename, mode, scope) for filename, _ in ANALYSES[name]['outputs']]
+
+def job_columns(name, scope):
+    columns = dataset.base_columns(importlib.import_module(ANALYSES[name]['module']).COLUMNS, scope)
+    if ANALYSES[name].get('cube') and scope != dataset.DEFAULT_SCOPE:
+        columns += dataset.base_columns(aggregate_cube.COLUMNS, scope)
+    return columns
+
+def analysis_key(name, context, options=DEFAULT_OPTIONS):
+    entry = ANALYSES[name]
+    inputs = list(entry.get('inputs', []))
+    if importlib.import_module(entry['module']).COLUMNS or entry.get('cube'):
+        inputs.append(context.data_path())
+    return build_key(entry['module'], inputs, {'source': context.source, **options})
+
+def apply_options(options):
+    figures.set_mode(options['output'])
+    figures.set_subdir(scope_subdir(options['scope']))
+    distributions.set_mode(options['distributions'])
+    dataset.set_scope(options['scope'])
+
+def describe_job(name, scope=dataset.DEFAULT_SCOPE):
+    description = ANALYSES[name]['description']
+    return description if scope == dataset.DEFAULT_SCOPE else f"{description} [{scope}]"
+
+def cached_result(name, entry, scope=dataset.DEFAULT_SCOPE):
+    return {
+        'name': job_name(name, scope),
+        'description': describe_job(name, scope),
+        'success': True,
+        'error': None,
+        'wall': 0.0,
+        'cpu': 0.0,
+        'cached': True,
+        'saved': entry['wall'],
+        'spans': [],
+    }
+
+def run_analysis(name, profile=None, options=DEFAULT_OPTIONS):
+    description = describe_job(name, options['scope'])
     print("\n" + "="*70)
     print(f"ĐANG CHẠY: {description}")
     print("="*70)
+    profiler = profiling.activate(**profile) if profile else None
+    apply_options(options)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
     try:
-        exec(open(script_name, encoding='utf-8').read(), {'__name__': '__main__'})
+        module = importlib.import_module(ANALYSES[name]['module'])
+        with profiler.section(job_name(name, options['scope'])) if profiler else contextlib.nullcontext():
+            module.run()
         print(f"Hoàn thành: {description}")
-        return True
+        success, error = True, None
     except Exception as e:
-        print(f"Lỗi khi chạy {script_name}: {str(e)}")
-        return False
+        print(f"Lỗi khi chạy {name}: {str(e)}")
+        success, error = False, str(e)
+    return {
+        'name': job_name(name, options['scope']),
+        'description': description,
+        'success': success,
+        'error': error,
+        'wall': time.perf_counter() - wall_start,
+        'cpu': time.process_time() - cpu_start,
+        'spans': profiler.take() if profiler else [],
+    }
+
+def run_analysis_captured(name, profile=None, options=DEFAULT_OPTIONS):
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        result = run_analysis(name, profile, options)
+    result['output'] = buffer.getvalue()
+    return result
+
+def run_parallel(jobs, workers, profile=None, options=DEFAULT_OPTIONS):
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {job: pool.submit(run_analysis_captured, job[0], profile, {**options, 'scope': job[1]})
+                   for job in jobs}
+        for name, scope in jobs:
+            try:
+                result = futures[name, scope].result()
+            except Exception as e:
+                result = {
+                    'name': job_name(name, scope),
+                    'description': describe_job(name, scope),
+                    'success': False,
+                    'error': f"worker lỗi: {e}",
+                    'wall': 0.0,
+                    'cpu': 0.0,
+                    'spans': [],
+                    'output': f"Lỗi khi chạy {job_name(name, scope)}: worker lỗi: {e}\n",
+                }
+            print(result.pop('output'), end='')
+            results.append(result)
+    return results
+
+def print_timing_table(results, total_wall):
+    width = max([20] + [len(result['name']) for result in results])
+    print(f"\n{'Phân tích':<{width}} {'Trạng thái':<11} {'Wall (s)':>9} {'CPU (s)':>9} {'Cache':>7}")
+    print("-" * (width + 40))
+    for result in results:
+        status = '✓ OK' if result['success'] else '✗ LỖI'
+        cache = 'HIT' if result.get('cached') else 'MISS'
+        print(f"{result['name']:<{width}} {status:<11} {result['wall']:>9.2f} {result['cpu']:>9.2f} {cache:>7}")
+    print("-" * (width + 40))
+    print(f"{'Tổng (wall toàn bộ lần chạy)':<{width + 12}} {total_wall:>9.2f} {sum(r['cpu'] for r in results):>9.2f}")
+    hits = [r for r in results if r.get('cached')]
+    if hits:
+        print(f"Cache: {len(hits)}/{len(results)} phân tích không đổi, "
+              f"tiết kiệm ~{sum(r['saved'] for r in hits):.2f} s")
+    for result in results:
+        if not result['success']:
+            print(f"  ✗ {result['name']}: {result['error']}")
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Chạy toàn bộ các phân tích TFT")
+    parser.add_argument('--only', default=None,
+                        help=f"Chỉ chạy các phân tích được chọn, cách nhau bởi dấu phẩy ({', '.join(ANALYSES)})")
+    parser.add_argument('--list', action='store_true', help="Liệt kê các phân tích có sẵn")
+    parser.add_argument('--parallel', action='store_true', help="Chạy các phân tích song song bằng process pool")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Số process tối đa khi chạy song song (mặc định: số CPU)")
+    parser.add_argument('--force', action='store_true',
+                        help="Bỏ qua build cache, chạy lại mọi phân tích được chọn")
+    parser.add_argument('--invalidate', default=None,
+                        help="Xóa cache của các phân tích này (cách nhau bởi dấu phẩy) trước khi chạy")
+    parser.add_argument('--profile', action='store_true',
+                        help="Đo thời gian từng stage, hot path và lần ghi file biểu đồ, ghi báo cáo JSON")
+    parser.add_argument('--profile-memory', action='store_true', help="Như --profile, kèm peak bộ nhớ (tracemalloc)")
+    parser.add_argument('--cprofile', default=None, help="Như --profile, kèm file cProfile cho từng phân tích trong thư mục này")
+    parser.add_argument('--profile-output', default=profiling.REPORT)
+    parser.add_argument('--dashboard', action='store_true',
+                        help="Xuất một dashboard HTML duy nhất (plotly.js dùng chung, dữ liệu biểu đồ tải theo tab)")
+    parser.add_argument('--scope', default=None,
+                        help=f"Scope thống kê, cách nhau bởi dấu phẩy hoặc 'all' ({', '.join(dataset.SCOPES)}; "
+                             f"mặc định {dataset.DEFAULT_SCOPE}). Các scope dùng chung một lần đọc dữ liệu, "
+                             "biểu đồ của scope khác mặc định nằm trong visualizations/<scope>/")
+    parser.add_argument('--distributions', choices=distributions.MODES, default='auto',
+                        help="Violin/histogram: raw = nhúng toàn bộ điểm, summary = KDE/quartile/bin tính sẵn, "
+                             f"auto = summary khi quá {distributions.RAW_MAX_POINTS} người chơi")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.list:
+        for name, entry in ANALYSES.items():
+            print(f"{name:<16} {entry['description']}")
+        return 0
+    try:
+        names = select_analyses(args.only)
+        invalidated = select_analyses(args.invalidate) if args.invalidate else []
+        scopes = select_scopes(args.scope)
+    except ValueError as e:
+        print(e)
+        return 2
+    
     print("="*70)
     print("TFT RANKED DATA ANALYSIS - COMPREHENSIVE STATISTICS")
     print("="*70)
@@ -24,40 +266,52 @@ def main():
         os.makedirs('visualizations')
         print("Đã tạo thư mục 'visualizations'")
     
-    analyses = [
-        {
-            'script': 'analysis_item_data.py',
-            'description': '1. Thống kê ItemData (AD, AP, Tank) - Treemap'
-        },
-        {
-            'script': 'analysis_avg_similarity.py',
-            'description': '2. Thống kê Độ Flexible (avg_similarity) - Histogram + Boxplot'
-        },
-        {
-            'script': 'analysis_top_carries.py',
-            'description': '3. Thống kê Top Carries - WordCloud + Network Graph'
-        },
-        {
-            'script': 'analysis_playstyle.py',
-            'description': '4. Thống kê Playstyle (Eco vs High Tempo) - Scatter + Regression'
-        },
-        {
-            'script': 'analysis_region.py',
-            'description': '5. Thống kê Người chơi theo Region - Map + Sunburst'
-        },
-        {
-            'script': 'analysis_performance.py',
-            'description': '6. Thống kê Performance (Winrate & Placement) - Heatmap + Violin'
-        }
-    ]
+    context = dataset.reset_context()
+    cache = BuildCache()
+    cache.invalidate([job_name(name, scope) for name in invalidated for scope in dataset.SCOPES])
+    mode = 'dashboard' if args.dashboard else 'standalone'
+    options = {'output': mode, 'distributions': args.distributions, 'scope': dataset.DEFAULT_SCOPE}
+    jobs = [(name, scope) for scope in scopes for name in names]
+    keys = {job: analysis_key(job[0], context, {**options, 'scope': job[1]}) for job in jobs}
+    hits = {}
+    for name, scope in jobs:
+        entry = None if args.force else cache.lookup(job_name(name, scope), keys[name, scope],
+                                                     output_paths(name, mode, scope))
+        if entry is not None:
+            hits[name, scope] = entry
+            print(f"Bỏ qua (cache): {describe_job(name, scope)}")
+    pending = [job for job in jobs if job not in hits]
     
-    results = []
-    for analysis in analyses:
-        success = run_analysis(analysis['script'], analysis['description'])
-        results.append({
-            'name': analysis['description'],
-            'success': success
-        })
+    profile = None
+    profiler = None
+    if args.profile or args.profile_memory or args.cprofile:
+        profile = {'memory': args.profile_memory, 'cprofile_dir': args.cprofile}
+        profiler = profiling.activate(**profile)
+    
+    with profiler.span('load', 'stage') if profiler else contextlib.nullcontext():
+        context.preload([col for name, scope in pending for col in job_columns(name, scope)])
+    spans = profiler.take() if profiler else []
+    
+    run_start = time.perf_counter()
+    if args.parallel and pending:
+        workers = args.workers or min(len(pending), os.cpu_count() or 1)
+        print(f"Chế độ song song: {workers} process")
+        fresh = run_parallel(pending, workers, profile, options)
+    else:
+        fresh = [run_analysis(name, profile, {**options, 'scope': scope}) for name, scope in pending]
+    total_wall = time.perf_counter() - run_start
+    for result in fresh:
+        spans.extend(result.pop('spans'))
+    
+    for job, result in zip(pending, fresh):
+        paths = output_paths(job[0], mode, job[1])
+        if result['success'] and all(os.path.exists(path) for path in paths):
+            cache.record(result['name'], keys[job], paths, result['wall'])
+        else:
+            cache.invalidate([result['name']])
+    cache.save()
+    fresh = dict(zip(pending, fresh))
+    results = [cached_result(job[0], hits[job], job[1]) if job in hits else fresh[job] for job in jobs]
     
     print("\n" + "="*70)
     print("TỔNG KẾT")
@@ -67,34 +321,47 @@ def main():
     total = len(results)
     
     print(f"\nĐã hoàn thành: {successful}/{total} phân tích")
-    print("\nChi tiết:")
-    for i, result in enumerate(results, 1):
-        print(f"{result['name']}")
+    print(f"Dữ liệu dùng chung: {context.loads} lần đọc ({context.source}), "
+          f"{len(context.loaded_columns)} cột, {context.load_time * 1000:.1f} ms")
+    print_timing_table(results, total_wall)
+    
+    if profiler:
+        profiling.deactivate()
+        profiling.write_report(args.profile_output, spans, {
+            'total_wall': total_wall,
+            'analyses': {r['name']: {'success': r['success'], 'cached': bool(r.get('cached')),
+                                     'wall': r['wall'], 'cpu': r['cpu']} for r in results},
+        })
+        profiling.print_summary(spans)
+        print(f"Báo cáo profiling: {args.profile_output}")
+        if args.cprofile:
+            print(f"File cProfile: {args.cprofile}/<phân tích>.prof")
     
     print("\n" + "="*70)
     print("CÁC FILE BIỂU ĐỒ ĐÃ TẠO (trong thư mục visualizations/):")
     print("="*70)
     
-    viz_files = [
-        ("item_data_treemap.html", "Treemap - Phân bố trang bị (Plotly Interactive)"),
-        ("avg_similarity_distribution.html", "Histogram + Boxplot - Độ flexible (Plotly Interactive)"),
-        ("top_carries_wordcloud.png", "WordCloud - Tướng carry phổ biến"),
-        ("top_carries_network.html", "Network Graph - Mối quan hệ tướng (Plotly Interactive)"),
-        ("playstyle_scatter.html", "Scatter + Regression - Phong cách chơi (Plotly Interactive)"),
-        ("region_map.html", "Map - Phân bố người chơi theo khu vực (Folium)"),
-        ("region_sunburst.html", "Sunburst - Phân bố theo châu lục (Plotly Interactive)"),
-        ("performance_heatmap.html", "Heatmap - Tương quan metrics (Plotly Interactive)"),
-        ("performance_violin.html", "Violin Plot - Phân tích performance (Plotly Interactive)")
-    ]
-    
-    for filename, description in viz_files:
-        filepath = os.path.join('visualizations', filename)
+    viz_files = [(output_path(name, filename, mode, scope), description)
+                 for name, scope in jobs for filename, description in ANALYSES[name]['outputs']]
+    
+    for filepath, description in viz_files:
+        filename = os.path.relpath(filepath, 'visualizations')
         if os.path.exists(filepath):
-            size = os.path.getsize(filepath)
             print(f"  ✓ {filename:<35} - {description}")
         else:
             print(f"  ✗ {filename:<35} - (Chưa tạo)")
     
+    if args.dashboard:
+        for scope in scopes:
+            tabs = {name: (entry['description'].split(' - ')[0], entry['outputs']) for name, entry in ANALYSES.items()
+                    if all(os.path.exists(path) for path in output_paths(name, mode, scope))}
+            shell, plotly_js = figures.build_dashboard(tabs, subdir=scope_subdir(scope))
+            charts = [path for name in tabs for path in output_paths(name, mode, scope)
+                      if path.startswith(figures.CHARTS_DIR)]
+            print(f"\n  Dashboard: {shell} ({len(tabs)} tab)")
+            print(f"    plotly.js dùng chung: {os.path.getsize(plotly_js) / 1024:.0f} KiB | "
+                  f"dữ liệu {len(charts)} biểu đồ: {sum(os.path.getsize(c) for c in charts) / 1024:.0f} KiB")
+    
     print("\n" + "="*70)
     print("BIỂU ĐỒ TƯƠNG TÁC (Interactive Charts):")
     print("="*70)
@@ -110,6 +377,8 @@ def main():
     print("\n" + "="*70)
     print(f"Thời gian kết thúc: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
+    
+    return 0 if successful == total else 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
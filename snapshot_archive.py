@@ -0,0 +1,246 @@
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+ARCHIVE_DIR = 'data/archive'
+INDEX_NAME = 'index.jsonl'
+CODECS = ('auto', 'zstd', 'xz', 'gzip', 'none')
+EXTENSIONS = {'zstd': '.zst', 'xz': '.xz', 'gzip': '.gz', 'none': ''}
+MAGIC = {b'\x28\xb5\x2f\xfd': 'zstd', b'\xfd7zXZ\x00': 'xz', b'\x1f\x8b': 'gzip'}
+ZSTD_LEVEL = 19
+XZ_PRESET = 6
+GZIP_LEVEL = 9
+DIGEST_PREFIX = 12
+
+
+def zstd_available():
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_codec(codec='auto'):
+    if codec == 'auto':
+        return 'zstd' if zstd_available() else 'xz'
+    return codec
+
+
+def path_codec(path):
+    for codec, ext in EXTENSIONS.items():
+        if ext and path.endswith(ext):
+            return codec
+    return 'none'
+
+
+def detect_codec(path):
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    for magic, codec in MAGIC.items():
+        if head.startswith(magic):
+            return codec
+    return 'none'
+
+
+def open_snapshot(path):
+    codec = detect_codec(path)
+    if codec == 'gzip':
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if codec == 'xz':
+        return lzma.open(path, 'rt', encoding='utf-8')
+    if codec == 'zstd':
+        import zstandard
+
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return io.TextIOWrapper(reader, encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+
+def load_json(path):
+    with open_snapshot(path) as f:
+        return json.load(f)
+
+
+def compact(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def compress(payload, codec):
+    if codec == 'gzip':
+        return gzip.compress(payload, GZIP_LEVEL, mtime=0)
+    if codec == 'xz':
+        return lzma.compress(payload, preset=XZ_PRESET)
+    if codec == 'zstd':
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    return payload
+
+
+def write_payload(payload, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return len(payload)
+
+
+def write_json(data, path, codec=None):
+    return write_payload(compress(compact(data), codec or path_codec(path)), path)
+
+
+def count_players(data):
+    return len(data.get('data', [])) if isinstance(data, dict) else len(data)
+
+
+def read_index(archive_dir=ARCHIVE_DIR):
+    try:
+        with open(os.path.join(archive_dir, INDEX_NAME), encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def archive_snapshot(data, archive_dir=ARCHIVE_DIR, fetched_at=None, codec='auto'):
+    payload = compact(data)
+    digest = hashlib.sha256(payload).hexdigest()
+    entries = read_index(archive_dir)
+    if entries and entries[-1]['digest'] == digest:
+        return entries[-1], False
+
+    codec = resolve_codec(codec)
+    fetched_at = fetched_at or datetime.now(timezone.utc)
+    name = (f"leaderboard-{fetched_at.astimezone(timezone.utc):%Y%m%dT%H%M%SZ}-{digest[:DIGEST_PREFIX]}"
+            f".json{EXTENSIONS[codec]}")
+    entry = {
+        'id': entries[-1]['id'] + 1 if entries else 1,
+        'file': name,
+        'fetched_at': fetched_at.isoformat(timespec='seconds'),
+        'players': count_players(data),
+        'codec': codec,
+        'raw_bytes': len(payload),
+        'bytes': write_payload(compress(payload, codec), os.path.join(archive_dir, name)),
+        'digest': digest,
+    }
+    with open(os.path.join(archive_dir, INDEX_NAME), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+    return entry, True
+
+
+def archive_file(path, archive_dir=ARCHIVE_DIR, fetched_at=None, codec='auto'):
+    if fetched_at is None:
+        fetched_at = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+    return archive_snapshot(load_json(path), archive_dir, fetched_at, codec)
+
+
+def snapshot_path(entry, archive_dir=ARCHIVE_DIR):
+    return os.path.join(archive_dir, entry['file'])
+
+
+def benchmark(path, codecs, repeat):
+    from json_to_csv import iter_records
+
+    data = load_json(path)
+    payloads = {'indent=2': json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'), 'compact': compact(data)}
+    seconds = {}
+    for codec in codecs:
+        start = time.perf_counter()
+        payloads[codec] = compress(payloads['compact'], codec)
+        seconds[codec] = time.perf_counter() - start
+
+    tmp_dir = os.path.join(os.path.dirname(path) or '.', '.archive_bench')
+    print(f"{'Định dạng':<10} {'Kích thước':>12} {'Tỉ lệ':>7} {'Nén (s)':>9} {'Đọc (s)':>9}")
+    try:
+        for label, payload in payloads.items():
+            target = os.path.join(tmp_dir, f'snapshot-{label}.json{EXTENSIONS.get(label, "")}')
+            write_payload(payload, target)
+            reads = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for _ in iter_records(target):
+                    pass
+                reads.append(time.perf_counter() - start)
+            print(f"{label:<10} {len(payload):>12,} {len(payloads['indent=2']) / len(payload):>6.1f}x "
+                  f"{seconds.get(label, 0.0):>9.3f} {min(reads):>9.3f}")
+    finally:
+        for name in os.listdir(tmp_dir):
+            os.remove(os.path.join(tmp_dir, name))
+        os.rmdir(tmp_dir)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Kho lưu trữ snapshot JSON thô, dạng gọn và nén, kèm index")
+    parser.add_argument('--dir', default=ARCHIVE_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    add = sub.add_parser('add', help="Lưu một file leaderboard JSON vào kho")
+    add.add_argument('--input', default='data/leaderboard.json')
+    add.add_argument('--fetched-at', default=None, help="Thời điểm lấy dữ liệu (ISO 8601, mặc định: mtime của file)")
+    add.add_argument('--codec', choices=CODECS, default='auto',
+                     help="auto = zstd nếu đã cài zstandard, ngược lại xz")
+
+    listing = sub.add_parser('list', help="Liệt kê các snapshot đã lưu")
+    listing.add_argument('--last', type=int, default=None)
+
+    sub.add_parser('latest', help="In đường dẫn snapshot mới nhất (dùng làm --input cho json_to_csv.py)")
+
+    bench = sub.add_parser('bench', help="So sánh kích thước và thời gian đọc các định dạng")
+    bench.add_argument('--input', default='data/leaderboard.json')
+    bench.add_argument('--repeat', type=int, default=3)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == 'add':
+        fetched_at = datetime.fromisoformat(args.fetched_at) if args.fetched_at else None
+        if fetched_at is not None and fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        if args.codec == 'zstd' and not zstd_available():
+            print("Chưa cài zstandard (pip install zstandard)")
+            return 2
+        entry, added = archive_file(args.input, args.dir, fetched_at, args.codec)
+        if added:
+            print(f"✓ Đã lưu snapshot #{entry['id']} vào {snapshot_path(entry, args.dir)} "
+                  f"({entry['bytes']:,} bytes, JSON gọn {entry['raw_bytes']:,} bytes)")
+        else:
+            print(f"Snapshot trùng với #{entry['id']} ({entry['file']}) - bỏ qua")
+        return 0
+
+    if args.command == 'bench':
+        codecs = [codec for codec in ('gzip', 'xz', 'zstd') if codec != 'zstd' or zstd_available()]
+        benchmark(args.input, codecs, args.repeat)
+        return 0
+
+    entries = read_index(args.dir)
+    if not entries:
+        print(f"Kho {args.dir} đang trống")
+        return 2
+    if args.command == 'latest':
+        print(snapshot_path(entries[-1], args.dir))
+        return 0
+
+    shown = entries[-args.last:] if args.last else entries
+    print(f"{'ID':>5}  {'Fetched at':<25} {'Players':>8} {'Codec':<5} {'Bytes':>11} {'JSON gọn':>11} {'Tỉ lệ':>7}")
+    for entry in shown:
+        print(f"{entry['id']:>5}  {entry['fetched_at']:<25} {entry['players']:>8} {entry['codec']:<5} "
+              f"{entry['bytes']:>11,} {entry['raw_bytes']:>11,} {entry['raw_bytes'] / entry['bytes']:>6.1f}x")
+    stored = sum(entry['bytes'] for entry in entries)
+    raw = sum(entry['raw_bytes'] for entry in entries)
+    print(f"\nTổng: {len(entries)} snapshot, {stored / 1024 / 1024:.2f} MiB trên đĩa "
+          f"(JSON gọn {raw / 1024 / 1024:.2f} MiB, {raw / stored:.1f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+import snapshot_store
+from json_to_csv import iter_records
+
+DIFF_COLUMNS = ['rank', 'summoner_region', 'riot_id', 'rating', 'rating_numeric', 'recent_lp_change']
+INTEGER_COLUMNS = ['rank', 'rating_numeric', 'recent_lp_change']
+DELTA_COLUMNS = ['rank_delta', 'rating_numeric_delta', 'lp_change_delta']
+
+
+def load_snapshot_file(input_file, columns=DIFF_COLUMNS):
+    rows = (snapshot_store.player_row(rec) for rec in iter_records(input_file))
+    frame = pd.DataFrame.from_records(rows, columns=['puuid'] + list(snapshot_store.PLAYER_COLUMNS))
+    return frame[['puuid'] + list(columns)]
+
+
+def diff_snapshots(old, new):
+    old = old.drop_duplicates('puuid').reset_index(drop=True)
+    new = new.drop_duplicates('puuid').reset_index(drop=True)
+
+    positions = pd.Index(old['puuid']).get_indexer(new['puuid'])
+    matched = positions >= 0
+    kept = np.zeros(len(old), dtype=bool)
+    kept[positions[matched]] = True
+
+    before = old.iloc[positions[matched]].reset_index(drop=True).astype({col: 'Int64' for col in INTEGER_COLUMNS})
+    after = new[matched].reset_index(drop=True).astype({col: 'Int64' for col in INTEGER_COLUMNS})
+    common = pd.DataFrame({
+        'puuid': after['puuid'],
+        'riot_id': after['riot_id'],
+        'summoner_region': after['summoner_region'],
+        'rank_before': before['rank'],
+        'rank_after': after['rank'],
+        'rank_delta': before['rank'] - after['rank'],
+        'rating_before': before['rating'],
+        'rating_after': after['rating'],
+        'rating_numeric_delta': after['rating_numeric'] - before['rating_numeric'],
+        'lp_change_delta': after['recent_lp_change'] - before['recent_lp_change'],
+    })
+    changed = np.zeros(len(common), dtype=bool)
+    for col in DELTA_COLUMNS:
+        changed |= (common[col] != 0).fillna(False).to_numpy(dtype=bool)
+    changed = pd.Series(changed, index=common.index)
+
+    return {
+        'entered': new[~matched].sort_values('rank', kind='stable').reset_index(drop=True),
+        'exited': old[~kept].sort_values('rank', kind='stable').reset_index(drop=True),
+        'moved': common[changed].sort_values('rank_after', kind='stable').reset_index(drop=True),
+        'unchanged': int((~changed).sum()),
+    }
+
+
+def region_summary(diff):
+    moved = diff['moved']
+    summary = pd.DataFrame({
+        'entered': diff['entered']['summoner_region'].value_counts(),
+        'exited': diff['exited']['summoner_region'].value_counts(),
+        'climbed': moved.loc[moved['rank_delta'] > 0, 'summoner_region'].value_counts(),
+        'dropped': moved.loc[moved['rank_delta'] < 0, 'summoner_region'].value_counts(),
+        'rating_delta_sum': moved.groupby('summoner_region')['rating_numeric_delta'].sum(),
+        'rank_delta_mean': moved.groupby('summoner_region')['rank_delta'].mean(),
+    })
+    counts = ['entered', 'exited', 'climbed', 'dropped', 'rating_delta_sum']
+    summary[counts] = summary[counts].fillna(0).astype('int64')
+    summary['rank_delta_mean'] = summary['rank_delta_mean'].fillna(0.0)
+    summary['net'] = summary['entered'] - summary['exited']
+    summary.index.name = 'summoner_region'
+    return summary.sort_values(['net', 'entered'], ascending=False)
+
+
+def show(value, spec=''):
+    if pd.isna(value):
+        return format('-', spec.replace('+d', ''))
+    return format(value, spec)
+
+
+def print_movers(rows):
+    for row in rows.itertuples():
+        print(f"  {show(row.riot_id, '<28')} {show(row.summoner_region, '<6')} #{show(row.rank_before, '>5')} -> "
+              f"#{show(row.rank_after, '<5')} ({show(row.rank_delta, '+d')}, {show(row.rating_numeric_delta, '+d')} LP)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="So sánh hai snapshot leaderboard (vào/ra top, thay đổi rank/LP)")
+    parser.add_argument('--db', default=snapshot_store.DB_PATH)
+    parser.add_argument('--old', type=int, default=None, help="snapshot_id cũ (mặc định: snapshot áp chót)")
+    parser.add_argument('--new', type=int, default=None, help="snapshot_id mới (mặc định: snapshot mới nhất)")
+    parser.add_argument('--old-file', default=None, help="So sánh trực tiếp từ file JSON thay vì kho snapshot")
+    parser.add_argument('--new-file', default=None)
+    parser.add_argument('--top', type=int, default=10)
+    return parser.parse_args(argv)
+
+
+def load_pair(args):
+    if args.old_file or args.new_file:
+        if not (args.old_file and args.new_file):
+            raise ValueError("Cần cả --old-file và --new-file")
+        return load_snapshot_file(args.old_file), load_snapshot_file(args.new_file)
+
+    conn = snapshot_store.connect(args.db)
+    try:
+        latest = snapshot_store.latest_snapshot_ids(conn, 2)
+        if (args.old is None or args.new is None) and len(latest) < 2:
+            raise ValueError(f"Cần ít nhất 2 snapshot trong {args.db}")
+        old_id = args.old if args.old is not None else latest[0]
+        new_id = args.new if args.new is not None else latest[-1]
+        print(f"So sánh snapshot #{old_id} -> #{new_id}")
+        return (snapshot_store.load_snapshot(conn, old_id, DIFF_COLUMNS),
+                snapshot_store.load_snapshot(conn, new_id, DIFF_COLUMNS))
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        old, new = load_pair(args)
+    except ValueError as e:
+        print(e)
+        return 2
+
+    diff = diff_snapshots(old, new)
+    moved = diff['moved']
+    print(f"Vào top: {len(diff['entered'])} | Rời top: {len(diff['exited'])} | "
+          f"Thay đổi: {len(moved)} | Không đổi: {diff['unchanged']}")
+
+    print(f"\n=== TOP {args.top} LEO HẠNG ===")
+    print_movers(moved[moved['rank_delta'] > 0].nlargest(args.top, 'rank_delta'))
+
+    print(f"\n=== TOP {args.top} TỤT HẠNG ===")
+    print_movers(moved[moved['rank_delta'] < 0].nsmallest(args.top, 'rank_delta'))
+
+    print("\n=== THEO KHU VỰC ===")
+    print(region_summary(diff).to_string())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,296 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+
+import aggregate_cube
+from dataset import DEFAULT_SCOPE, resolve
+from json_to_csv import flatten, iter_records
+
+DB_PATH = 'data/snapshots.sqlite'
+BATCH_SIZE = 5000
+
+PLAYER_COLUMNS = {
+    'rank': ('rank', 'INTEGER'),
+    'summoner_region': ('summoner_region', 'TEXT'),
+    'riot_id': ('riot_id', 'TEXT'),
+    'rating': ('rating', 'TEXT'),
+    'rating_numeric': ('rating_numeric', 'INTEGER'),
+    'num_played': ('num_played', 'INTEGER'),
+    'wins': ('stats.wins', 'INTEGER'),
+    'place_sum': ('stats.place_sum', 'INTEGER'),
+    'recent_num_played': ('stats.RecentResult.num_played', 'INTEGER'),
+    'recent_wins': ('stats.RecentResult.wins', 'INTEGER'),
+    'recent_place_sum': ('stats.RecentResult.place_sum', 'INTEGER'),
+    'recent_lp_change': ('stats.RecentResult.lpChange', 'INTEGER'),
+    'patch_num_played': ('stats.currentPatchResult.num_played', 'INTEGER'),
+    'patch_wins': ('stats.currentPatchResult.wins', 'INTEGER'),
+    'patch_place_sum': ('stats.currentPatchResult.place_sum', 'INTEGER'),
+    'patch_lp_change': ('stats.currentPatchResult.lpChange', 'INTEGER'),
+}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_id INTEGER PRIMARY KEY,
+    fetched_at TEXT NOT NULL,
+    source TEXT,
+    digest TEXT,
+    players INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_fetched_at ON snapshots (fetched_at);
+CREATE TABLE IF NOT EXISTS players (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (snapshot_id),
+    puuid TEXT NOT NULL,
+    {', '.join(f'{name} {sql_type}' for name, (_, sql_type) in PLAYER_COLUMNS.items())},
+    PRIMARY KEY (snapshot_id, puuid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_players_puuid ON players (puuid, snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_players_region ON players (summoner_region, snapshot_id);
+CREATE TABLE IF NOT EXISTS cube (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (snapshot_id),
+    summoner_region TEXT,
+    performance_tier TEXT,
+    rating_band INTEGER,
+    {', '.join(f'{name} NUMERIC' for name in aggregate_cube.MEASURES)}
+);
+CREATE INDEX IF NOT EXISTS idx_cube_snapshot ON cube (snapshot_id);
+"""
+
+
+def connect(path=DB_PATH):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def player_row(rec):
+    return flat_player_row(flatten(rec))
+
+
+def flat_player_row(flat):
+    return (flat.get('puuid'),) + tuple(flat.get(key) for key, _ in PLAYER_COLUMNS.values())
+
+
+def batch_cube(rows):
+    import pandas as pd
+
+    return aggregate_cube.build(pd.DataFrame(rows, columns=aggregate_cube.COLUMNS))
+
+
+def insert_cube(conn, snapshot_id, cube):
+    columns = aggregate_cube.DIMENSIONS + aggregate_cube.MEASURES
+    rows = [(snapshot_id,) + tuple(None if value is None or value != value else value for value in row)
+            for row in cube[columns].astype(object).itertuples(index=False)]
+    conn.executemany(f"INSERT INTO cube (snapshot_id, {', '.join(columns)}) "
+                     f"VALUES ({', '.join('?' * (len(columns) + 1))})", rows)
+
+
+def records_digest(records):
+    digest = hashlib.sha256()
+    for rec in records:
+        digest.update(json.dumps(rec, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def latest_digest(conn):
+    return conn.execute("SELECT snapshot_id, digest FROM snapshots "
+                        "ORDER BY fetched_at DESC, snapshot_id DESC LIMIT 1").fetchone()
+
+
+def add_snapshot(conn, records, fetched_at=None, source=None, digest=None):
+    if digest is None:
+        records = list(records)
+        digest = records_digest(records)
+    latest = latest_digest(conn)
+    if latest is not None and latest[1] == digest:
+        return latest[0], False
+
+    fetched_at = fetched_at or datetime.now(timezone.utc).isoformat(timespec='seconds')
+    insert = (f"INSERT INTO players (snapshot_id, puuid, {', '.join(PLAYER_COLUMNS)}) "
+              f"VALUES ({', '.join('?' * (len(PLAYER_COLUMNS) + 2))})")
+    with conn:
+        snapshot_id = conn.execute(
+            "INSERT INTO snapshots (fetched_at, source, digest, players) VALUES (?, ?, ?, 0)",
+            (fetched_at, source, digest)
+        ).lastrowid
+        seen = set()
+        batch = []
+        cube_rows = []
+        cubes = []
+        cube_fields = [resolve(col, DEFAULT_SCOPE) for col in aggregate_cube.COLUMNS]
+        for rec in records:
+            flat = flatten(rec)
+            row = flat_player_row(flat)
+            if row[0] in seen:
+                continue
+            seen.add(row[0])
+            batch.append((snapshot_id,) + row)
+            cube_rows.append([flat.get(col) for col in cube_fields])
+            if len(batch) >= BATCH_SIZE:
+                conn.executemany(insert, batch)
+                cubes.append(batch_cube(cube_rows))
+                batch = []
+                cube_rows = []
+        conn.executemany(insert, batch)
+        cubes.append(batch_cube(cube_rows))
+        insert_cube(conn, snapshot_id, aggregate_cube.merge(cubes))
+        conn.execute("UPDATE snapshots SET players = ? WHERE snapshot_id = ?", (len(seen), snapshot_id))
+    return snapshot_id, True
+
+
+def add_snapshot_file(conn, input_file, fetched_at=None):
+    if fetched_at is None:
+        mtime = os.path.getmtime(input_file)
+        fetched_at = datetime.fromtimestamp(mtime, timezone.utc).isoformat(timespec='seconds')
+    return add_snapshot(conn, iter_records(input_file), fetched_at, source=input_file,
+                        digest=records_digest(iter_records(input_file)))
+
+
+def list_snapshots(conn, last=None):
+    query = "SELECT snapshot_id, fetched_at, source, players FROM snapshots ORDER BY fetched_at DESC, snapshot_id DESC"
+    params = ()
+    if last is not None:
+        query += " LIMIT ?"
+        params = (last,)
+    return conn.execute(query, params).fetchall()[::-1]
+
+
+def latest_snapshot_ids(conn, last=1):
+    return [row[0] for row in list_snapshots(conn, last)]
+
+
+def check_column(column):
+    if column not in PLAYER_COLUMNS:
+        raise ValueError(f"Không có cột: {column} (có: {', '.join(PLAYER_COLUMNS)})")
+    return column
+
+
+def player_history(conn, puuid, column='rating_numeric'):
+    check_column(column)
+    return conn.execute(
+        f"SELECT s.snapshot_id, s.fetched_at, p.rank, p.{column} "
+        f"FROM players p JOIN snapshots s ON s.snapshot_id = p.snapshot_id "
+        f"WHERE p.puuid = ? ORDER BY s.fetched_at, s.snapshot_id",
+        (puuid,)
+    ).fetchall()
+
+
+def region_counts(conn, last=30, region=None):
+    ids = latest_snapshot_ids(conn, last)
+    if not ids:
+        return []
+    query = (f"SELECT s.snapshot_id, s.fetched_at, p.summoner_region, COUNT(*) "
+             f"FROM players p JOIN snapshots s ON s.snapshot_id = p.snapshot_id "
+             f"WHERE p.snapshot_id IN ({', '.join('?' * len(ids))})")
+    params = list(ids)
+    if region is not None:
+        query += " AND p.summoner_region = ?"
+        params.append(region)
+    query += " GROUP BY s.snapshot_id, p.summoner_region ORDER BY s.fetched_at, s.snapshot_id, p.summoner_region"
+    return conn.execute(query, params).fetchall()
+
+
+def snapshot_cube(conn, snapshot_id):
+    import pandas as pd
+
+    columns = aggregate_cube.DIMENSIONS + aggregate_cube.MEASURES
+    return pd.read_sql_query(f"SELECT {', '.join(columns)} FROM cube WHERE snapshot_id = ?",
+                             conn, params=(snapshot_id,))
+
+
+def cube_history(conn, by='summoner_region', last=30):
+    if by not in aggregate_cube.DIMENSIONS:
+        raise ValueError(f"Không có chiều: {by} (có: {', '.join(aggregate_cube.DIMENSIONS)})")
+    ids = latest_snapshot_ids(conn, last)
+    if not ids:
+        return []
+    return conn.execute(
+        f"SELECT s.snapshot_id, s.fetched_at, c.{by}, SUM(c.players), "
+        f"SUM(c.wins) * 100.0 / SUM(c.num_played), SUM(c.rating_sum) / SUM(c.rating_players) "
+        f"FROM cube c JOIN snapshots s ON s.snapshot_id = c.snapshot_id "
+        f"WHERE c.snapshot_id IN ({', '.join('?' * len(ids))}) "
+        f"GROUP BY s.snapshot_id, c.{by} ORDER BY s.fetched_at, s.snapshot_id, c.{by}",
+        ids
+    ).fetchall()
+
+
+def load_snapshot(conn, snapshot_id=None, columns=None):
+    import pandas as pd
+
+    if snapshot_id is None:
+        ids = latest_snapshot_ids(conn, 1)
+        if not ids:
+            raise ValueError("Kho snapshot đang trống")
+        snapshot_id = ids[0]
+    columns = [check_column(col) for col in columns] if columns else list(PLAYER_COLUMNS)
+    return pd.read_sql_query(
+        f"SELECT puuid, {', '.join(columns)} FROM players WHERE snapshot_id = ? ORDER BY puuid",
+        conn, params=(snapshot_id,)
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Kho lịch sử snapshot leaderboard (SQLite)")
+    parser.add_argument('--db', default=DB_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    add = sub.add_parser('add', help="Thêm một snapshot JSON vào kho")
+    add.add_argument('--input', default='data/leaderboard.json')
+    add.add_argument('--fetched-at', default=None, help="Thời điểm lấy dữ liệu (ISO 8601, mặc định: mtime của file)")
+
+    listing = sub.add_parser('list', help="Liệt kê các snapshot")
+    listing.add_argument('--last', type=int, default=None)
+
+    history = sub.add_parser('history', help="Lịch sử một cột của một người chơi")
+    history.add_argument('--puuid', required=True)
+    history.add_argument('--column', default='rating_numeric')
+
+    regions = sub.add_parser('regions', help="Số người chơi theo khu vực qua các snapshot gần nhất")
+    regions.add_argument('--last', type=int, default=30)
+    regions.add_argument('--region', default=None)
+
+    cube = sub.add_parser('cube', help="Cube tổng hợp (người chơi, winrate, rating) qua các snapshot gần nhất")
+    cube.add_argument('--by', default='summoner_region', help=f"Một chiều ({', '.join(aggregate_cube.DIMENSIONS)})")
+    cube.add_argument('--last', type=int, default=30)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    conn = connect(args.db)
+    try:
+        if args.command == 'add':
+            snapshot_id, added = add_snapshot_file(conn, args.input, args.fetched_at)
+            if added:
+                print(f"✓ Đã thêm snapshot #{snapshot_id} từ {args.input} vào {args.db}")
+            else:
+                print(f"Snapshot trùng với #{snapshot_id} - bỏ qua")
+        elif args.command == 'list':
+            for snapshot_id, fetched_at, source, players in list_snapshots(conn, args.last):
+                print(f"#{snapshot_id:<6} {fetched_at:<26} {players:>7} người chơi  {source or ''}")
+        elif args.command == 'history':
+            for snapshot_id, fetched_at, rank, value in player_history(conn, args.puuid, args.column):
+                print(f"#{snapshot_id:<6} {fetched_at:<26} rank {rank:>5}  {args.column}: {value}")
+        elif args.command == 'regions':
+            for snapshot_id, fetched_at, region, count in region_counts(conn, args.last, args.region):
+                print(f"#{snapshot_id:<6} {fetched_at:<26} {region:<6} {count:>6}")
+        elif args.command == 'cube':
+            for snapshot_id, fetched_at, key, players, winrate, rating in cube_history(conn, args.by, args.last):
+                print(f"#{snapshot_id:<6} {fetched_at:<26} {str(key):<16} {players:>7}  "
+                      f"WR {winrate or 0:>6.2f}%  rating {rating or 0:>7.1f}")
+    except ValueError as e:
+        print(e)
+        return 2
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
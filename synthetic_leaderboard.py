@@ -0,0 +1,173 @@
+import argparse
+import csv
+import json
+import math
+import os
+
+import numpy as np
+
+from analysis_region import region_info
+
+CHAMPIONS_CSV = 'data/champions.csv'
+CHUNK_SIZE = 10000
+SCOPES = ('RecentResult', 'currentPatchResult')
+PUUID_ALPHABET = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'))
+SIZE_SUFFIXES = {'': 1, 'k': 1000, 'm': 1000000}
+
+
+def parse_size(value):
+    value = value.strip().lower()
+    suffix = value[-1:] if value[-1:] in ('k', 'm') else ''
+    try:
+        n = float(value[:len(value) - len(suffix)]) * SIZE_SUFFIXES[suffix]
+    except ValueError:
+        n = 0
+    if not math.isfinite(n) or n < 1 or n != int(n):
+        raise argparse.ArgumentTypeError(f"Kích thước không hợp lệ: {value!r} (vd. 500, 20k, 2.5m)")
+    return int(n)
+
+
+def parse_sizes(value):
+    sizes = [parse_size(size) for size in value.split(',') if size.strip()]
+    if not sizes:
+        raise argparse.ArgumentTypeError("Cần ít nhất một kích thước")
+    return sizes
+
+
+def champion_names(path=CHAMPIONS_CSV):
+    if not os.path.exists(path):
+        return [f'Champion{i}' for i in range(60)]
+    with open(path, encoding='utf-8', newline='') as f:
+        return [row['name'] for row in csv.DictReader(f)]
+
+
+def region_weights(rng):
+    regions = [code for code, info in region_info.items() if info['continent'] != 'Test Server']
+    weights = rng.pareto(1.2, len(regions)) + 0.05
+    return np.array(regions), weights / weights.sum()
+
+
+def ladder_rating(ranks):
+    lp = (2100 / np.sqrt(1 + ranks / 300)).astype(np.int64)
+    tiers = np.where(ranks <= 1000, 'CHALLENGER I', np.where(ranks <= 3000, 'GRANDMASTER I', 'MASTER I'))
+    return lp + 2800, [f'{tier} {points} LP' for tier, points in zip(tiers, lp.tolist())]
+
+
+def scope_columns(rng, size, num_played):
+    percentile_count = np.minimum(num_played, rng.integers(15, 21, size))
+    placement = rng.uniform(3.0, 4.8, size)
+    similarity = rng.uniform(0.1, 0.6, size).round(4)
+    missing = rng.random(size) < 0.05
+    return {
+        'AD': rng.integers(20, 140, size),
+        'AP': rng.integers(20, 140, size),
+        'Tank': rng.integers(40, 180, size),
+        'damage_percentile_sum': (percentile_count * rng.uniform(25, 75, size)).astype(np.int64),
+        'board_strength_percentile_sum': (percentile_count * rng.uniform(25, 75, size)).astype(np.int64),
+        'percentile_count': percentile_count,
+        'num_played': num_played,
+        'wins': rng.binomial(num_played, rng.uniform(0.08, 0.32, size)),
+        'place_sum': (num_played * placement).astype(np.int64),
+        'avg_similarity': [None if m else s for m, s in zip(missing.tolist(), similarity.tolist())],
+        'lpChange': rng.normal(0, 150, size).astype(np.int64),
+        'carries': rng.choice(3, size, p=[0.5, 0.28, 0.22]),
+    }
+
+
+def top_carries(rng, k, num_played, champions):
+    picks = rng.choice(len(champions), k, replace=False)
+    return [{'character_id': f'TFT15_{champions[i]}',
+             'count': int(rng.integers(1, max(2, num_played // 2))),
+             'avg': round(float(rng.uniform(1.5, 5.0)), 2)} for i in picks]
+
+
+def generate_chunk(rng, start, size, regions, weights, champions):
+    ranks = np.arange(start + 1, start + size + 1)
+    rating_numeric, ratings = ladder_rating(ranks)
+    region = rng.choice(regions, size, p=weights)
+    num_played = rng.integers(80, 900, size)
+    player_id = rng.integers(1_000_000, 999_999_999, size)
+    puuid = [''.join(chars) for chars in rng.choice(PUUID_ALPHABET, (size, 78))]
+    recent = scope_columns(rng, size, np.full(size, 20))
+    patch = scope_columns(rng, size, rng.integers(20, 120, size))
+    live = rng.random(size) < 0.045
+    win_rate = rng.uniform(0.1, 0.28, size)
+    placement = rng.uniform(3.2, 4.6, size)
+
+    for i in range(size):
+        stats = {
+            'num_played': int(num_played[i]),
+            'place_sum': int(num_played[i] * placement[i]),
+            'wins': int(num_played[i] * win_rate[i]),
+        }
+        for scope, cols in zip(SCOPES, (recent, patch)):
+            stats[scope] = {
+                'ItemData': {'Tank': int(cols['Tank'][i]), 'AD': int(cols['AD'][i]), 'AP': int(cols['AP'][i])},
+                'topCarries': top_carries(rng, int(cols['carries'][i]), int(cols['num_played'][i]), champions),
+                'damage_percentile_sum': int(cols['damage_percentile_sum'][i]),
+                'board_strength_percentile_sum': int(cols['board_strength_percentile_sum'][i]),
+                'percentile_count': int(cols['percentile_count'][i]),
+                'num_played': int(cols['num_played'][i]),
+                'wins': int(cols['wins'][i]),
+                'place_sum': int(cols['place_sum'][i]),
+                'avg_similarity': cols['avg_similarity'][i],
+                'lpChange': int(cols['lpChange'][i]),
+            }
+        stats['appMatches'] = False
+        rec = {
+            'player_id': str(player_id[i]),
+            'summoner_region': str(region[i]),
+            'riot_id': f'Player{start + i + 1}#{str(region[i]).upper()}',
+            'puuid': puuid[i],
+            'rating': ratings[i],
+            'rating_numeric': int(rating_numeric[i]),
+            'num_played': int(num_played[i]),
+            'rank': start + i + 1,
+            'stats': stats,
+        }
+        if live[i]:
+            rec['live'] = {
+                'type': 'leaderboard',
+                'player_id': str(player_id[i]),
+                'match_id': f'{str(region[i]).upper()}_{int(rng.integers(7_000_000_000, 8_000_000_000))}',
+                'game_start_time': str(int(rng.integers(1_760_000_000_000, 1_770_000_000_000))),
+                'encryption_key': ''.join(rng.choice(PUUID_ALPHABET, 32)),
+            }
+        yield rec
+
+
+def generate_records(n, seed=0, champions=None):
+    rng = np.random.default_rng(seed)
+    regions, weights = region_weights(rng)
+    champions = champions or champion_names()
+    for start in range(0, n, CHUNK_SIZE):
+        yield from generate_chunk(rng, start, min(CHUNK_SIZE, n - start), regions, weights, champions)
+
+
+def write_snapshot(path, n, seed=0, champions=None):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'meta': {'total': n, 'offset': 0, 'limit': n}})[:-1])
+        f.write(', "data": [')
+        for i, rec in enumerate(generate_records(n, seed, champions)):
+            if i:
+                f.write(', ')
+            f.write(json.dumps(rec, ensure_ascii=False))
+        f.write(']}')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sinh leaderboard giả lập theo cấu trúc MetaTFT (có seed)")
+    parser.add_argument('--players', type=parse_size, default='10k',
+                        help="Số người chơi: số nguyên, có thể kèm hậu tố k/m (vd. 500, 20k, 2.5m)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='data/synthetic/leaderboard.json')
+    args = parser.parse_args(argv)
+
+    write_snapshot(args.output, args.players, args.seed)
+    print(f"Saved synthetic JSON to {args.output} ({args.players} players, seed {args.seed})")
+
+
+if __name__ == '__main__':
+    main()
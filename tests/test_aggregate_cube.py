@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregate_cube
+from aggregate_cube import COLUMNS, DIMENSIONS, MEASURES, build, merge, read_cube, rollup, write_cube
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(5)
+    n = 1500
+    num_played = rng.integers(0, 300, n)
+    wins = (num_played * rng.uniform(0.05, 0.4, n)).astype(int)
+    frame = pd.DataFrame({
+        'summoner_region': rng.choice(['kr', 'euw1', 'na1', 'vn2'], n),
+        'rating_numeric': rng.integers(800, 2400, n).astype(float),
+        '{results}.wins': wins,
+        '{results}.num_played': num_played,
+        '{results}.place_sum': (num_played * rng.uniform(2.5, 5.5, n)).astype(int),
+        'stats.{scope}.ItemData.AD': rng.integers(0, 100, n).astype(float),
+        'stats.{scope}.ItemData.AP': rng.integers(0, 100, n).astype(float),
+        'stats.{scope}.ItemData.Tank': rng.integers(0, 100, n).astype(float),
+    })
+    frame.loc[::37, 'rating_numeric'] = np.nan
+    frame.loc[::53, ['stats.{scope}.ItemData.AD', 'stats.{scope}.ItemData.AP', 'stats.{scope}.ItemData.Tank']] = np.nan
+    return frame[COLUMNS]
+
+
+def split(frame, parts):
+    bounds = np.linspace(0, len(frame), parts + 1).astype(int)
+    return [frame.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def normalized(cube):
+    cube = cube.sort_values(DIMENSIONS, na_position='last').reset_index(drop=True)
+    return cube[DIMENSIONS + MEASURES].astype({col: 'float64' for col in MEASURES})
+
+
+@pytest.mark.parametrize('parts', [2, 7, 50])
+def test_merge_of_chunks_equals_whole(frame, parts):
+    chunks = [build(chunk) for chunk in split(frame, parts)]
+    pd.testing.assert_frame_equal(normalized(merge(chunks)), normalized(build(frame)), check_dtype=False)
+
+
+def test_merge_is_order_independent(frame):
+    a, b, c = (build(chunk) for chunk in split(frame, 3))
+    pd.testing.assert_frame_equal(normalized(merge([a, merge([b, c])])), normalized(merge([c, b, a])),
+                                  check_dtype=False)
+
+
+def test_rollup_matches_direct_aggregation(frame):
+    regions = rollup(build(frame), 'summoner_region')
+    grouped = frame.groupby('summoner_region')
+    assert (regions['players'] == grouped.size()).all()
+    pooled = grouped['{results}.wins'].sum() / grouped['{results}.num_played'].sum() * 100
+    np.testing.assert_allclose(regions['pooled_winrate'], pooled)
+    np.testing.assert_allclose(regions['mean_rating'], grouped['rating_numeric'].mean())
+    np.testing.assert_allclose(regions['mean_ad'], grouped['stats.{scope}.ItemData.AD'].mean())
+
+    rated = frame[frame['{results}.num_played'] > 0]
+    winrate = rated['{results}.wins'] / rated['{results}.num_played'] * 100
+    np.testing.assert_allclose(regions['mean_winrate'], winrate.groupby(rated['summoner_region']).mean())
+
+    total = rollup(build(frame))
+    assert total['players'].iloc[0] == len(frame)
+
+
+def test_rollup_filters(frame):
+    cube = build(frame)
+    kr = rollup(cube, 'rating_band', summoner_region='kr')
+    assert kr['players'].sum() == (frame['summoner_region'] == 'kr').sum()
+
+
+def test_empty_and_round_trip(frame, tmp_path):
+    assert len(build(frame.iloc[:0])) == 0
+    assert len(merge([aggregate_cube.empty(), aggregate_cube.empty()])) == 0
+    cube = build(frame)
+    path = write_cube(cube, str(tmp_path / 'cube.csv'))
+    pd.testing.assert_frame_equal(normalized(read_cube(path)), normalized(cube), check_dtype=False)
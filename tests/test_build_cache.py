@@ -0,0 +1,62 @@
+import pytest
+
+from build_cache import BuildCache, build_key, local_sources
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'analysis_x.py').write_text('import numpy\nfrom helper import f\n', encoding='utf-8')
+    (tmp_path / 'helper.py').write_text('import json\n\ndef f():\n    return 1\n', encoding='utf-8')
+    (tmp_path / 'unrelated.py').write_text('x = 1\n', encoding='utf-8')
+    (tmp_path / 'input.csv').write_text('a,b\n1,2\n', encoding='utf-8')
+    return tmp_path
+
+
+def key(params=None):
+    return build_key('analysis_x', ['input.csv'], params)
+
+
+def test_local_sources_follow_project_imports(project):
+    assert local_sources('analysis_x') == ['./analysis_x.py', './helper.py']
+
+
+def test_key_is_stable(project):
+    assert key() == key()
+
+
+@pytest.mark.parametrize('path, text', [
+    ('analysis_x.py', 'import numpy\nfrom helper import f\n# changed\n'),
+    ('helper.py', 'import json\n\ndef f():\n    return 2\n'),
+    ('input.csv', 'a,b\n1,3\n'),
+])
+def test_key_changes_with_code_or_inputs(project, path, text):
+    before = key()
+    (project / path).write_text(text, encoding='utf-8')
+    assert key() != before
+
+
+def test_key_ignores_unrelated_files_and_depends_on_params(project):
+    before = key({'scope': 'overall'})
+    (project / 'unrelated.py').write_text('x = 2\n', encoding='utf-8')
+    assert key({'scope': 'overall'}) == before
+    assert key({'scope': 'RecentResult'}) != before
+
+
+def test_cache_lookup_and_invalidation(project):
+    (project / 'out.html').write_text('<html></html>', encoding='utf-8')
+    cache = BuildCache(str(project / 'manifest.json'))
+    current = key()
+    cache.record('x', current, ['out.html'], 1.5)
+    cache.save()
+
+    cache = BuildCache(str(project / 'manifest.json'))
+    assert cache.lookup('x', current, ['out.html'])['wall'] == 1.5
+    assert cache.lookup('x', 'stale', ['out.html']) is None
+    assert cache.lookup('x', current, ['missing.html']) is None
+
+    (project / 'helper.py').write_text('def f():\n    return 3\n', encoding='utf-8')
+    assert cache.lookup('x', key(), ['out.html']) is None
+
+    cache.invalidate(['x'])
+    assert cache.lookup('x', current, ['out.html']) is None
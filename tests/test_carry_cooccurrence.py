@@ -0,0 +1,81 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from carry_cooccurrence import cooccurrence
+
+CHAMPIONS = [f'Champ{i}' for i in range(12)]
+
+
+@pytest.fixture
+def ladder():
+    rng = np.random.default_rng(7)
+    players = pd.DataFrame({
+        'puuid': [f'p{i}' for i in range(200)],
+        'summoner_region': rng.choice(['kr', 'euw1', 'na1'], 200),
+        'rating_numeric': rng.integers(1000, 2000, 200),
+    })
+    rows = []
+    for puuid in players['puuid'][:150]:
+        for champion_id in rng.choice(len(CHAMPIONS), rng.integers(1, 5)):
+            rows.append((puuid, int(champion_id)))
+    rows.append(rows[0])
+    carries = pd.DataFrame(rows, columns=['puuid', 'champion_id'])
+    carries['champion'] = pd.Categorical.from_codes(carries['champion_id'], categories=CHAMPIONS)
+    return carries, players
+
+
+def dense_pairs(carries, n_players):
+    present = pd.crosstab(carries['puuid'], carries['champion'].astype(str)).reindex(columns=CHAMPIONS, fill_value=0) > 0
+    rows = []
+    for a, b in itertools.combinations(CHAMPIONS, 2):
+        count = int((present[a] & present[b]).sum())
+        if count:
+            support_a, support_b = int(present[a].sum()), int(present[b].sum())
+            rows.append((a, b, count, support_a, support_b, count * n_players / (support_a * support_b)))
+    return pd.DataFrame(rows, columns=['champion_a', 'champion_b', 'count', 'support_a', 'support_b', 'lift'])
+
+
+def compare(sparse, dense):
+    key = ['champion_a', 'champion_b']
+    merged = sparse.merge(dense, on=key, suffixes=('', '_dense'), validate='one_to_one')
+    assert len(merged) == len(sparse) == len(dense)
+    for col in ('count', 'support_a', 'support_b'):
+        assert (merged[col] == merged[f'{col}_dense']).all()
+    np.testing.assert_allclose(merged['lift'], merged['lift_dense'])
+    np.testing.assert_allclose(merged['pmi'], np.log2(merged['lift_dense']))
+
+
+def test_matches_dense_baseline_over_all_players(ladder):
+    carries, players = ladder
+    pairs = cooccurrence(carries, players)
+    assert pairs.attrs['n_players'] == 200
+    assert pairs.attrs['population'] == 'all'
+    compare(pairs, dense_pairs(carries, 200))
+
+
+def test_without_players_uses_carriers(ladder):
+    carries, _ = ladder
+    pairs = cooccurrence(carries)
+    assert pairs.attrs['n_players'] == 150
+    assert pairs.attrs['population'] == 'carriers'
+    compare(pairs, dense_pairs(carries, 150))
+
+
+def test_region_and_rating_filters(ladder):
+    carries, players = ladder
+    band = (1200, 1700)
+    pairs = cooccurrence(carries, players, regions=['kr', 'na1'], rating_band=band)
+    selected = players[players['summoner_region'].isin(['kr', 'na1'])
+                       & (players['rating_numeric'] >= band[0]) & (players['rating_numeric'] < band[1])]
+    assert pairs.attrs['n_players'] == len(selected)
+    compare(pairs, dense_pairs(carries[carries['puuid'].isin(selected['puuid'])], len(selected)))
+
+
+def test_thresholds(ladder):
+    carries, players = ladder
+    pairs = cooccurrence(carries, players, min_count=3, min_lift=1.0)
+    assert (pairs['count'] >= 3).all() and (pairs['lift'] >= 1.0).all()
+    assert list(pairs['count']) == sorted(pairs['count'], reverse=True)
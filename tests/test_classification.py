@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from classification import PERFORMANCE_TIERS, PLAYSTYLES, classify, cut_points, labels
+
+
+def legacy_performance(row):
+    wr = row['winrate']
+    ap = row['avg_placement']
+    if wr >= 25 and ap <= 3.5:
+        return 'Elite'
+    elif wr >= 20 and ap <= 4.0:
+        return 'High Performer'
+    elif wr >= 15 and ap <= 4.5:
+        return 'Above Average'
+    else:
+        return 'Average'
+
+
+def legacy_playstyle(row, damage_median, board_median):
+    damage = row['damage']
+    board = row['board_strength']
+    if damage > damage_median and board > board_median:
+        return 'High Tempo (Aggressive)'
+    elif damage < damage_median and board < board_median:
+        return 'Eco (Conservative)'
+    elif damage > damage_median:
+        return 'Damage Focus'
+    else:
+        return 'Board Strength Focus'
+
+
+@pytest.fixture
+def players():
+    rng = np.random.default_rng(3)
+    n = 2000
+    frame = pd.DataFrame({
+        'winrate': rng.uniform(5, 35, n).round(1),
+        'avg_placement': rng.uniform(2.5, 5.5, n).round(2),
+        'damage': rng.integers(0, 50, n),
+        'board_strength': rng.integers(0, 50, n),
+        'region': rng.choice(['kr', 'euw1', 'na1'], n),
+    }, index=rng.permutation(n))
+    frame.loc[frame.index[:20], ['winrate', 'avg_placement']] = [[25, 3.5], [20, 4.0], [15, 4.5], [24.9, 3.5]] * 5
+    return frame
+
+
+def test_performance_tiers_match_legacy(players):
+    expected = players.apply(legacy_performance, axis=1)
+    pd.testing.assert_series_equal(classify(players, PERFORMANCE_TIERS), expected, check_dtype=False)
+
+
+def test_playstyles_match_legacy(players):
+    damage_median = players['damage'].median()
+    board_median = players['board_strength'].median()
+    expected = players.apply(legacy_playstyle, axis=1, args=(damage_median, board_median))
+    pd.testing.assert_series_equal(classify(players, PLAYSTYLES), expected, check_dtype=False)
+    assert cut_points(players, PLAYSTYLES) == {('damage', 0.5): damage_median, ('board_strength', 0.5): board_median}
+
+
+def test_playstyles_by_group_use_group_medians(players):
+    result = classify(players, PLAYSTYLES, by='region')
+    for _, group in players.groupby('region'):
+        expected = group.apply(legacy_playstyle, axis=1,
+                               args=(group['damage'].median(), group['board_strength'].median()))
+        pd.testing.assert_series_equal(result.loc[group.index], expected, check_dtype=False)
+
+
+def test_labels_and_missing_values():
+    assert labels(PERFORMANCE_TIERS) == ['Elite', 'High Performer', 'Above Average', 'Average']
+    frame = pd.DataFrame({'winrate': [np.nan, 30.0], 'avg_placement': [3.0, np.nan]})
+    assert list(classify(frame, PERFORMANCE_TIERS)) == ['Average', 'Average']
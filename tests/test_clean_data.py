@@ -0,0 +1,53 @@
+import os
+
+import pandas as pd
+import pytest
+
+import clean_data
+
+RAW_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'leaderboard.csv')
+
+
+@pytest.fixture
+def raw(tmp_path):
+    path = tmp_path / 'leaderboard.csv'
+    pd.read_csv(RAW_CSV, nrows=300).to_csv(path, index=False)
+    return str(path)
+
+
+def clean(raw, directory, chunksize):
+    os.makedirs(directory, exist_ok=True)
+    outputs = [os.path.join(directory, name) for name in ('cleaned.csv', 'cleaned.parquet', 'cube.csv')]
+    result = clean_data.clean_file(raw, *outputs[:2], chunksize, outputs[2])
+    return result, outputs
+
+
+@pytest.mark.parametrize('chunksize', [7, 64, 299, 1000])
+def test_chunked_matches_full(raw, tmp_path, chunksize):
+    (rows, missing, after), full = clean(raw, tmp_path / 'full', None)
+    (chunk_rows, chunk_missing, chunk_after), chunked = clean(raw, tmp_path / 'chunked', chunksize)
+
+    assert (chunk_rows, chunk_after) == (rows, after)
+    pd.testing.assert_series_equal(chunk_missing, missing, check_names=False)
+    with open(full[0], encoding='utf-8') as a, open(chunked[0], encoding='utf-8') as b:
+        assert a.read() == b.read()
+    pd.testing.assert_frame_equal(pd.read_parquet(chunked[1]), pd.read_parquet(full[1]))
+    pd.testing.assert_frame_equal(pd.read_csv(chunked[2]), pd.read_csv(full[2]))
+
+
+def test_schema_types(raw, tmp_path):
+    _, (_, parquet, _) = clean(raw, tmp_path, None)
+    cleaned = pd.read_parquet(parquet)
+    assert cleaned.isnull().sum().sum() == 0
+    assert cleaned['stats.currentPatchResult.lpChange'].dtype == 'int64'
+    assert cleaned['stats.RecentResult.avg_similarity'].dtype == 'float64'
+
+
+@pytest.mark.parametrize('chunksize', [None, 10])
+def test_header_only_input(raw, tmp_path, chunksize):
+    empty = tmp_path / 'empty.csv'
+    with open(raw, encoding='utf-8') as f:
+        empty.write_text(f.readline(), encoding='utf-8')
+    (rows, missing, after), (csv_path, _, _) = clean(str(empty), tmp_path / 'out', chunksize)
+    assert (rows, len(missing), after) == (0, 0, 0)
+    assert len(pd.read_csv(csv_path)) == 0
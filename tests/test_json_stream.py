@@ -0,0 +1,60 @@
+import io
+import json
+
+import pytest
+
+from json_to_csv import _StreamReader, iter_records
+
+RECORDS = [
+    {'puuid': 'a', 'rating_numeric': 1234, 'ratio': 12.5, 'tiny': -3.25e-4, 'big': 1E+21},
+    {'puuid': 'b', 'riot_id': 'quote \" backslash \\ tab \t uni é中', 'nested': {'x': [1, 2.0, None]}},
+    17.5,
+    -2e10,
+    'bare \\"string\\"',
+    [],
+    {},
+]
+DOCUMENT = {'meta': {'total': 7, 'scale': 2.5e-3}, 'data': RECORDS, 'total': 12.5}
+
+
+def read_object(reader):
+    reader.expect('{')
+    result = {}
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        result[key] = list(reader.array()) if key == 'data' else reader.value()
+        if reader.expect(',}') == '}':
+            return result
+
+
+@pytest.mark.parametrize('chunk_size', range(1, 8))
+@pytest.mark.parametrize('indent', [None, 2])
+def test_object_at_small_chunk_sizes(chunk_size, indent):
+    text = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False)
+    assert read_object(_StreamReader(io.StringIO(text), chunk_size)) == DOCUMENT
+
+
+@pytest.mark.parametrize('chunk_size', range(1, 8))
+@pytest.mark.parametrize('value', [12.5, -0.001, 6.02e23, 1e-7, 42, -7, 'esc \\" \\\\ \\n é'])
+def test_scalar_split_at_every_offset(chunk_size, value):
+    text = json.dumps({'total': value, 'data': [value, value]})
+    assert read_object(_StreamReader(io.StringIO(text), chunk_size)) == {'total': value, 'data': [value, value]}
+
+
+@pytest.mark.parametrize('chunk_size', range(1, 8))
+def test_top_level_array(chunk_size):
+    reader = _StreamReader(io.StringIO(json.dumps(RECORDS)), chunk_size)
+    assert list(reader.array()) == RECORDS
+
+
+def test_iter_records_matches_json_load(tmp_path):
+    path = tmp_path / 'leaderboard.json'
+    path.write_text(json.dumps(DOCUMENT), encoding='utf-8')
+    assert list(iter_records(str(path))) == RECORDS
+
+
+def test_truncated_document_raises():
+    reader = _StreamReader(io.StringIO('[1, 2.'), 2)
+    with pytest.raises(ValueError):
+        list(reader.array())
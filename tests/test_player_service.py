@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+import player_service
+
+REGIONS = ['na1', 'euw1', 'kr']
+
+
+@pytest.fixture
+def index():
+    rows = []
+    for i in range(60):
+        player = {
+            'rank': i + 1,
+            'summoner_region': REGIONS[i % len(REGIONS)],
+            'riot_id': f'alpha{i:02d}#TAG',
+            'rating': 'Challenger',
+            'rating_numeric': 1500 - i * 10,
+        }
+        rows.append((f'puuid-{i}',) + tuple(player.get(key) for key in player_service.FIELDS[1:]))
+    return player_service.PlayerIndex(rows, 'fixture')
+
+
+def get(index, target):
+    status, body = index.handle(target)
+    return status, json.loads(body)
+
+
+def test_search_limit(index):
+    assert len(get(index, '/search?riot_id=alpha')[1]['results']) == player_service.SEARCH_LIMIT
+    assert len(get(index, '/search?riot_id=alpha&limit=3')[1]['results']) == 3
+
+
+@pytest.mark.parametrize('target', ['/search?riot_id=a&limit=-1', '/search?riot_id=a&limit=0',
+                                    '/region/na1?limit=-5'])
+def test_non_positive_limit_is_rejected(index, target):
+    status, payload = get(index, target)
+    assert status == 400
+    assert 'limit' in payload['error']
+
+
+@pytest.mark.parametrize('target', ['/rank/1?limit=0', '/player/puuid-0?limit=-1'])
+def test_limit_is_ignored_by_routes_without_it(index, target):
+    assert get(index, target)[0] == 200
+
+
+@pytest.mark.parametrize('rating', ['nan', 'inf', '-inf', '1e400'])
+def test_non_finite_rating_is_rejected(index, rating):
+    status, payload = get(index, f'/percentile?rating={rating}')
+    assert status == 400
+    assert f'/percentile?rating={rating}' not in index.cache.items
+
+
+def test_percentile(index):
+    status, payload = get(index, '/percentile?rating=1500')
+    assert status == 200
+    assert payload['percentile'] == 100.0
@@ -0,0 +1,52 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+import snapshot_archive
+from json_to_csv import iter_records
+
+DATA = {'meta': {'total': 3}, 'data': [
+    {'puuid': 'a', 'riot_id': 'Ä#1', 'rating_numeric': 1500, 'ratio': 0.125},
+    {'puuid': 'b', 'riot_id': 'quote "x"', 'stats': {'RecentResult': {'lpChange': -12}}},
+    {'puuid': 'c', 'live': None},
+]}
+CODECS = ['gzip', 'xz', 'none'] + (['zstd'] if snapshot_archive.zstd_available() else [])
+
+
+@pytest.mark.parametrize('codec', CODECS)
+def test_write_and_stream_round_trip(tmp_path, codec):
+    path = str(tmp_path / f'snapshot.json{snapshot_archive.EXTENSIONS[codec]}')
+    size = snapshot_archive.write_json(DATA, path)
+    assert size == (tmp_path / path).stat().st_size
+    assert snapshot_archive.detect_codec(path) == codec
+    assert snapshot_archive.load_json(path) == DATA
+    assert list(iter_records(path)) == DATA['data']
+
+
+@pytest.mark.parametrize('codec', CODECS)
+def test_archive_index_and_dedupe(tmp_path, codec):
+    fetched_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    first, added = snapshot_archive.archive_snapshot(DATA, str(tmp_path), fetched_at, codec)
+    assert added
+    again, added = snapshot_archive.archive_snapshot(DATA, str(tmp_path), fetched_at, codec)
+    assert not added and again == first
+
+    changed = dict(DATA, data=DATA['data'][:2])
+    second, added = snapshot_archive.archive_snapshot(changed, str(tmp_path), fetched_at, codec)
+    assert added and second['id'] == 2 and second['file'] != first['file']
+
+    entries = snapshot_archive.read_index(str(tmp_path))
+    assert [entry['players'] for entry in entries] == [3, 2]
+    assert snapshot_archive.load_json(snapshot_archive.snapshot_path(entries[0], str(tmp_path))) == DATA
+    assert list(iter_records(snapshot_archive.snapshot_path(entries[1], str(tmp_path)))) == changed['data']
+
+
+def test_archive_file_uses_mtime(tmp_path):
+    source = tmp_path / 'leaderboard.json'
+    source.write_text(json.dumps(DATA, indent=2), encoding='utf-8')
+    entry, added = snapshot_archive.archive_file(str(source), str(tmp_path / 'archive'), codec='gzip')
+    assert added
+    assert entry['raw_bytes'] == len(snapshot_archive.compact(DATA))
+    mtime = datetime.fromtimestamp(source.stat().st_mtime, timezone.utc)
+    assert entry['fetched_at'] == mtime.isoformat(timespec='seconds')
@@ -0,0 +1,39 @@
+import pandas as pd
+
+import snapshot_diff
+
+
+def snapshot(rows):
+    return pd.DataFrame(rows, columns=['puuid'] + snapshot_diff.DIFF_COLUMNS)
+
+
+def test_missing_rating_on_one_side():
+    old = snapshot([
+        ('a', 1, 'EUW', 'A#1', 'Challenger', 1200, 30),
+        ('b', 2, 'NA', 'B#1', 'Challenger', None, 10),
+        ('c', 3, 'KR', 'C#1', 'Challenger', 1000, 5),
+    ])
+    new = snapshot([
+        ('a', 2, 'EUW', 'A#1', 'Challenger', 1180, 30),
+        ('b', 1, 'NA', 'B#1', 'Challenger', 1250, 10),
+        ('c', 3, 'KR', 'C#1', 'Challenger', None, 5),
+    ])
+
+    diff = snapshot_diff.diff_snapshots(old, new)
+    moved = diff['moved'].set_index('puuid')
+
+    assert list(moved.index) == ['b', 'a']
+    assert diff['unchanged'] == 1
+    assert str(moved['rating_numeric_delta'].dtype) == 'Int64'
+    assert moved.loc['b', 'rank_delta'] == 1
+    assert pd.isna(moved.loc['b', 'rating_numeric_delta'])
+    assert snapshot_diff.region_summary(diff).loc['NA', 'climbed'] == 1
+
+
+def test_movers_print_null_as_dash(capsys):
+    old = snapshot([('b', 2, 'NA', 'B#1', 'Challenger', None, 10)])
+    new = snapshot([('b', 1, 'NA', 'B#1', 'Challenger', 1250, 10)])
+
+    snapshot_diff.print_movers(snapshot_diff.diff_snapshots(old, new)['moved'])
+
+    assert capsys.readouterr().out.rstrip().endswith('#    2 -> #1     (+1, - LP)')
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming_stats import K, RANK_ERROR, QuantileSketch, StreamStats, describe
+
+QS = np.array([0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99])
+
+
+def rank_error(values, estimates, qs=QS):
+    ordered = np.sort(values)
+    ranks = np.searchsorted(ordered, estimates, side='left') / len(ordered)
+    upper = np.searchsorted(ordered, estimates, side='right') / len(ordered)
+    return np.maximum(0, np.maximum(ranks - qs, qs - upper)).max()
+
+
+@pytest.fixture(params=['uniform', 'normal', 'pareto'])
+def values(request):
+    rng = np.random.default_rng(11)
+    n = 300_000
+    return {'uniform': rng.uniform(0, 100, n), 'normal': rng.normal(50, 10, n),
+            'pareto': rng.pareto(1.5, n)}[request.param]
+
+
+def test_small_inputs_are_exact():
+    values = np.random.default_rng(1).normal(size=K)
+    sketch = QuantileSketch().update(values)
+    assert sketch.exact
+    np.testing.assert_allclose(sketch.quantiles(QS), pd.Series(values).quantile(QS).to_numpy())
+
+
+def test_rank_error_bound(values):
+    sketch = QuantileSketch()
+    for chunk in np.array_split(values, 17):
+        sketch.update(chunk)
+    assert not sketch.exact
+    assert sum(len(level) for level in sketch.levels) < 2 * K
+    assert rank_error(values, sketch.quantiles(QS)) <= RANK_ERROR
+
+
+def test_merged_sketches_keep_the_bound(values):
+    parts = [QuantileSketch(seed=i).update(chunk) for i, chunk in enumerate(np.array_split(values, 40))]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert merged.count == len(values)
+    assert rank_error(values, merged.quantiles(QS)) <= RANK_ERROR
+
+
+def test_moments_merge_exactly(values):
+    left, right = np.array_split(values, [12345])
+    merged = StreamStats().update(left).merge(StreamStats().update(right)).summary()
+    assert merged['count'] == len(values)
+    assert merged['mean'] == pytest.approx(values.mean(), rel=1e-12)
+    assert merged['std'] == pytest.approx(values.std(ddof=1), rel=1e-9)
+    assert (merged['min'], merged['max']) == (values.min(), values.max())
+
+
+def test_describe_ignores_nan():
+    values = np.array([1.0, np.nan, 3.0, 2.0, np.nan])
+    summary = describe(values, chunk_size=2)
+    assert summary['count'] == 3
+    assert (summary['median'], summary['mean'], summary['exact']) == (2.0, 2.0, True)
+    assert np.isnan(describe([])['median'])
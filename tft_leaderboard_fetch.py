@@ -1,47 +1,344 @@
+import argparse
+import hashlib
 import json
+import os
+import random
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+
+import snapshot_archive
 
 URL = "https://api.metatft.com/tft-leaderboard/v2/global?offset=0&limit=1000&queue=undefined"
+BASE_URL = "https://api.metatft.com/tft-leaderboard/v2/global"
 
+HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "application/json",
+}
 
-def fetch_json(url: str, timeout: int = 30):
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept": "application/json",
-    }
-    response = requests.get(url, headers=headers, timeout=timeout)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+CACHE_DIR = "data/cache/http"
+STATE_SUFFIX = ".state.json"
+
+
+def fetch_json(url: str, timeout: int = 30, session=None):
+    getter = session.get if session is not None else requests.get
+    response = getter(url, headers=HEADERS, timeout=timeout)
     response.raise_for_status()
     return response.json()
 
 
 def save_json(data, path: str):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-
-try:
-    data = fetch_json(URL)
-except requests.exceptions.HTTPError as e:
-    print(f"HTTP error: {e}")
-    sys.exit(1)
-except requests.exceptions.ConnectionError as e:
-    print(f"Network error: {e}")
-    sys.exit(1)
-except requests.exceptions.Timeout as e:
-    print(f"Timeout error: {e}")
-    sys.exit(1)
-except requests.exceptions.RequestException as e:
-    print(f"Request error: {e}")
-    sys.exit(1)
-except json.JSONDecodeError as e:
-    print(f"JSON parse error: {e}")
-    sys.exit(1)
-
-try:
-    save_json(data, "data/leaderboard.json")
-except OSError as e:
-    print(f"File write error: {e}")
-    sys.exit(1)
-
-print(f"Saved JSON to leaderboard.json")
+    return snapshot_archive.write_json(data, path)
+
+
+class HostRateLimiter:
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+
+def make_session(pool_size: int = 8):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def page_url(base_url: str, offset: int, limit: int, queue: str = "undefined"):
+    return f"{base_url}?{urlencode({'offset': offset, 'limit': limit, 'queue': queue})}"
+
+
+def backoff_delay(attempt: int, backoff: float, retry_after=None):
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, backoff * (2 ** attempt))
+
+
+class Page:
+    def __init__(self, url: str, body: bytes, cached: bool = False):
+        self.url = url
+        self.body = body
+        self.cached = cached
+        self.digest = hashlib.sha256(body).hexdigest()
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class ResponseCache:
+    def __init__(self, directory: str = CACHE_DIR, ttl: float = 300):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, key + ".json"), os.path.join(self.directory, key + ".body")
+
+    def get(self, url: str):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        return meta, body
+
+    def is_fresh(self, meta):
+        return meta is not None and time.time() - meta.get("fetched_at", 0) < self.ttl
+
+    def conditional_headers(self, meta):
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def put(self, url: str, body: bytes, response_headers=None, meta=None):
+        meta_path, body_path = self._paths(url)
+        response_headers = response_headers or {}
+        meta = dict(meta or {})
+        meta.update({
+            "url": url,
+            "fetched_at": time.time(),
+            "sha256": hashlib.sha256(body).hexdigest(),
+        })
+        if response_headers.get("ETag"):
+            meta["etag"] = response_headers["ETag"]
+        if response_headers.get("Last-Modified"):
+            meta["last_modified"] = response_headers["Last-Modified"]
+        _write_atomic(body_path, body)
+        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+def _write_atomic(path: str, payload: bytes):
+    tmp_path = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def request_with_retry(session, url: str, limiter: HostRateLimiter, timeout: int = 30,
+                       retries: int = 3, backoff: float = 0.5, headers=None):
+    host = urlsplit(url).netloc
+    for attempt in range(retries + 1):
+        limiter.acquire(host)
+        retry_after = None
+        try:
+            response = session.get(url, timeout=timeout, headers=headers)
+            if response.status_code in RETRY_STATUS and attempt < retries:
+                retry_after = response.headers.get("Retry-After")
+                raise requests.exceptions.HTTPError(f"{response.status_code} for url: {url}", response=response)
+            response.raise_for_status()
+            return response
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.HTTPError) as e:
+            status = e.response.status_code if getattr(e, "response", None) is not None else None
+            if attempt >= retries or (status is not None and status not in RETRY_STATUS):
+                raise
+            time.sleep(backoff_delay(attempt, backoff, retry_after))
+
+
+def fetch_page(session, url: str, limiter: HostRateLimiter, timeout: int = 30,
+               retries: int = 3, backoff: float = 0.5, cache: ResponseCache = None):
+    meta, cached_body = cache.get(url) if cache is not None else (None, None)
+    if cached_body is not None and cache.is_fresh(meta):
+        return Page(url, cached_body, cached=True)
+
+    headers = cache.conditional_headers(meta) if cached_body is not None else None
+    response = request_with_retry(session, url, limiter, timeout, retries, backoff, headers)
+    if response.status_code == 304 and cached_body is not None:
+        cache.put(url, cached_body, response.headers, meta)
+        return Page(url, cached_body, cached=True)
+
+    body = response.content
+    if cache is not None:
+        cache.put(url, body, response.headers)
+    return Page(url, body)
+
+
+def merge_pages(pages):
+    seen = set()
+    records = []
+    for page in pages:
+        rows = page.get("data", []) if isinstance(page, dict) else page
+        for rec in rows:
+            key = rec.get("puuid") or (rec.get("summoner_region"), rec.get("player_id"))
+            if key in seen:
+                continue
+            seen.add(key)
+            records.append(rec)
+    records.sort(key=lambda r: r.get("rank") if r.get("rank") is not None else float("inf"))
+    return {
+        "meta": {"total": len(records), "offset": 0, "limit": len(records)},
+        "data": records,
+    }
+
+
+def ladder_urls(base_url: str = BASE_URL, total: int = 1000, page_size: int = 200,
+                queue: str = "undefined"):
+    return [page_url(base_url, offset, min(page_size, total - offset), queue)
+            for offset in range(0, total, page_size)]
+
+
+def fetch_pages(urls, workers: int = 4, rate: float = 5.0, timeout: int = 30,
+                retries: int = 3, backoff: float = 0.5, cache: ResponseCache = None):
+    limiter = HostRateLimiter(rate, burst=workers)
+    with make_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(
+            lambda url: fetch_page(session, url, limiter, timeout, retries, backoff, cache),
+            urls
+        ))
+
+
+def fetch_ladder(base_url: str = BASE_URL, total: int = 1000, page_size: int = 200,
+                 workers: int = 4, rate: float = 5.0, timeout: int = 30,
+                 retries: int = 3, backoff: float = 0.5, queue: str = "undefined",
+                 cache: ResponseCache = None):
+    pages = fetch_pages(ladder_urls(base_url, total, page_size, queue), workers, rate,
+                        timeout, retries, backoff, cache)
+    return merge_pages([page.json() for page in pages])
+
+
+def load_state(output: str):
+    try:
+        with open(output + STATE_SUFFIX, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(output: str, pages):
+    state = {
+        "fetched_at": time.time(),
+        "pages": {page.url: page.digest for page in pages},
+    }
+    with open(output + STATE_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+def is_unchanged(output: str, pages):
+    state = load_state(output)
+    return os.path.exists(output) and state.get("pages") == {page.url: page.digest for page in pages}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tải leaderboard TFT từ MetaTFT API")
+    parser.add_argument("--output", default="data/leaderboard.json")
+    parser.add_argument("--paged", action="store_true",
+                        help="Chia ladder thành nhiều trang offset/limit và tải song song")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--total", type=int, default=1000, help="Số người chơi cần tải (chế độ --paged)")
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=5.0, help="Số request/giây tối đa cho mỗi host")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--backoff", type=float, default=0.5)
+    parser.add_argument("--timeout", type=int, default=30)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--cache-ttl", type=float, default=300,
+                        help="Dùng lại response trong cache mà không gọi API nếu chưa quá TTL (giây)")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--force", action="store_true", help="Ghi lại snapshot kể cả khi nội dung không đổi")
+    parser.add_argument("--unchanged-exit-code", type=int, default=0,
+                        help="Mã thoát khi ladder không đổi (vd. 3 để dừng chuỗi lệnh phía sau)")
+    parser.add_argument("--archive", default=snapshot_archive.ARCHIVE_DIR,
+                        help="Thư mục lưu trữ snapshot thô dạng nén kèm index ('' để bỏ qua)")
+    parser.add_argument("--archive-codec", choices=snapshot_archive.CODECS, default="auto",
+                        help="auto = zstd nếu đã cài zstandard, ngược lại xz")
+    parser.add_argument("--history", default="data/snapshots.sqlite",
+                        help="Kho lịch sử snapshot SQLite để lưu thêm mỗi lần tải ('' để bỏ qua)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cache = None if args.no_cache else ResponseCache(args.cache_dir, args.cache_ttl)
+    urls = ladder_urls(args.base_url, args.total, args.page_size) if args.paged else [URL]
+    try:
+        pages = fetch_pages(urls, args.workers, args.rate, args.timeout, args.retries,
+                            args.backoff, cache)
+        if not args.force and is_unchanged(args.output, pages):
+            cached = sum(page.cached for page in pages)
+            print(f"Ladder không thay đổi ({cached}/{len(pages)} trang lấy từ cache) - bỏ qua {args.output}")
+            sys.exit(args.unchanged_exit_code)
+        data = merge_pages([page.json() for page in pages]) if args.paged else pages[0].json()
+    except requests.exceptions.HTTPError as e:
+        print(f"HTTP error: {e}")
+        sys.exit(1)
+    except requests.exceptions.ConnectionError as e:
+        print(f"Network error: {e}")
+        sys.exit(1)
+    except requests.exceptions.Timeout as e:
+        print(f"Timeout error: {e}")
+        sys.exit(1)
+    except requests.exceptions.RequestException as e:
+        print(f"Request error: {e}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"JSON parse error: {e}")
+        sys.exit(1)
+
+    try:
+        save_json(data, args.output)
+        save_state(args.output, pages)
+    except OSError as e:
+        print(f"File write error: {e}")
+        sys.exit(1)
+
+    print(f"Saved JSON to {args.output} ({len(data.get('data', []))} players)")
+
+    if args.archive:
+        entry, added = snapshot_archive.archive_snapshot(data, args.archive, codec=args.archive_codec)
+        if added:
+            print(f"Archived snapshot #{entry['id']} to {snapshot_archive.snapshot_path(entry, args.archive)} "
+                  f"({entry['bytes']} bytes)")
+
+    if args.history:
+        import snapshot_store
+
+        conn = snapshot_store.connect(args.history)
+        try:
+            snapshot_id, added = snapshot_store.add_snapshot(conn, data.get("data", []), source=args.output)
+        finally:
+            conn.close()
+        if added:
+            print(f"Saved snapshot #{snapshot_id} to {args.history}")
+
+
+if __name__ == "__main__":
+    main()